@@ -1,10 +1,13 @@
 # Miminised Thumby grayscale library (version 4.0.2-hemlock)
 # See: https://github.com/Timendus/thumby-grayscale
 
-from utime import sleep_ms, ticks_diff, ticks_ms, sleep_us
-from machine import Pin, SPI, idle, mem32
-import _thread
+from utime import sleep_ms, ticks_diff, ticks_ms, sleep_us, ticks_us
 from array import array
+from sys import platform
+_HOST = platform != "rp2" # Off device, see hostdisplay.py
+if not _HOST:
+    from machine import Pin, SPI, idle, mem32
+    import _thread
 
 emulator = None
 try:
@@ -18,10 +21,12 @@ _ST_THREAD       = const(0)
 _ST_COPY_BUFFS   = const(1)
 _ST_CALIBRATOR   = const(2)
 _ST_MODE         = const(3)
+_ST_SUBMIT       = const(4)
 _WIDTH = const(72)
 _HEIGHT = const(40)
 _BUFF_SIZE = const((_HEIGHT // 8) * _WIDTH)
 _BUFF_INT_SIZE = const(_BUFF_SIZE // 4)
+_DIRTY_SIZE = const((_BUFF_INT_SIZE+31) // 32)
 # Timing parameters for each mode
 _params = bytearray([
     # time_pre
@@ -64,15 +69,32 @@ class Grayscale:
         self._res.init(Pin.OUT, value=1)
         self._dc.init(Pin.OUT, value=0)
         self._cs.init(Pin.OUT, value=1)
-        self.drawBuffer = bytearray(_BUFF_SIZE*2)
-        self.buffer = memoryview(self.drawBuffer)[:_BUFF_SIZE]
-        self.shading = memoryview(self.drawBuffer)[_BUFF_SIZE:]
+        # Two draw buffers, so the next frame can be drawn while the
+        # GPU thread converts the last one (unless sync is set).
+        self._drawBuffers = (bytearray(_BUFF_SIZE*2), bytearray(_BUFF_SIZE*2))
+        self._views = tuple((b, memoryview(b)[:_BUFF_SIZE],
+            memoryview(b)[_BUFF_SIZE:]) for b in self._drawBuffers)
+        self._draw = 0
+        self.drawBuffer, self.buffer, self.shading = self._views[0]
+        self.sync = False
+        # Wait for the 60 FPS frame interval in update
+        # (unset when the caller paces the frames).
+        self.pace = True
+        # Time (in microseconds) update spent waiting for the GPU thread
+        # to take frames (for profiling)
+        self.wait_us = array('l', [0])
+        # Bitmap of the buffer words changed since the last submitted
+        # frame, marked by whatever draws the frame (all words unless it
+        # clears and marks them), and the copy handed to the GPU thread
+        # to only convert those words.
+        self.dirty = array('L', [-1]*_DIRTY_SIZE)
+        self._dirty = array('L', [0]*_DIRTY_SIZE)
         self._subframes = array('O', [bytearray(_BUFF_SIZE),
             bytearray(_BUFF_SIZE), bytearray(_BUFF_SIZE)])
         self.lastUpdateEnd = 0
         self._contrastSrc = bytearray(18)
         self._contrast = bytearray(3)
-        self._state = array('I', [_THREAD_STOPPED,0,87,0])
+        self._state = array('I', [_THREAD_STOPPED,0,87,0,0])
 
     # GPU (Gray Processing Unit) thread function
     @micropython.viper
@@ -82,6 +104,9 @@ class Grayscale:
         contrast = ptr8(self._contrast)
         bb = ptr32(self.buffer)
         bs = ptr32(self.shading)
+        db = self._drawBuffers
+        srca = array('L', [ptr32(db[0]), ptr32(db[1])])
+        srcs = ptr32(srca) # Addresses of the draw buffers
         sf = self._subframes
         params = ptr8(_params)
         mode = state[_ST_MODE]
@@ -89,8 +114,10 @@ class Grayscale:
         b2 = ptr32(sf[1])
         b3 = ptr32(sf[2])
         subframes = ptr32(array('L', [b1, b2, b3]))
-        d1 = int(0xAA55AA55)
-        d2 = int(0x55AA55AA)
+        dirty = ptr32(self._dirty)
+        # Dithering for every word (((i&3)+i)&1 is always even)
+        di1 = int(0x55AA55AA)
+        di2 = int(0xAA55AA55)
         sio = ptr32(0xd0000000)
         spi0 = ptr32(0x4003c000)
         tmr = ptr32(0x40054000)
@@ -127,15 +154,20 @@ class Grayscale:
                     i += 1
                 if fn == 2 and (state[_ST_COPY_BUFFS] != 0 or mode != state[_ST_MODE]):
                     i = 0
+                    # Convert everything on mode changes
+                    full = mode != state[_ST_MODE]
                     mode = state[_ST_MODE]
+                    # Convert the changed words of the submitted draw buffer
+                    bb = ptr32(srcs[state[_ST_SUBMIT]])
+                    bs = ptr32(srcs[state[_ST_SUBMIT]] + _BUFF_SIZE)
                     while i < _BUFF_INT_SIZE:
+                        if not full and not (dirty[i>>5] >> (i&31)) & 1:
+                            i += 1
+                            continue
                         v1 = bb[i]
                         v2 = bs[i]
                         wd = v1 ^ v2
                         w = v1 & wd
-                        di = ((i&3)+i)&1
-                        di1 = (d1 if di else d2)
-                        di2 =  (d2 if di else d1)
                         b1[i] = wd
                         b2[i] = v1
                         b3[i] = w
@@ -170,19 +202,46 @@ class Grayscale:
                 while (tmr[10] - (time_pre + params[18+mfn]*calib)) < 0: pass
                 fn += 1
 
+    @micropython.viper
+    def _hand_over(self):
+        # Give the GPU thread the words marked as changed for this frame,
+        # and mark all words for the next frame (until a drawer clears it).
+        src = ptr32(self.dirty)
+        dirty = ptr32(self._dirty)
+        i = 0
+        while i < _DIRTY_SIZE:
+            dirty[i] = src[i]
+            src[i] = -1
+            i += 1
+
     @micropython.native
     def update(self):
         state = self._state
         if emulator:
             mem32[0xD0000000+0x01C] = 1 << 2
         elif state[_ST_THREAD] == _THREAD_RUNNING:
-            state[_ST_COPY_BUFFS] = 1
+            t = ticks_us()
+            # Wait for the GPU thread to take any last frame still pending
             while state[_ST_COPY_BUFFS] != 0:
                 idle()
+            self._hand_over()
+            state[_ST_SUBMIT] = self._draw
+            state[_ST_COPY_BUFFS] = 1
+            if self.sync:
+                while state[_ST_COPY_BUFFS] != 0:
+                    idle()
+            else:
+                # Draw the next frame to the other buffer meanwhile
+                self._draw ^= 1
+                self.drawBuffer, self.buffer, self.shading = (
+                    self._views[self._draw])
+            self.wait_us[0] += ticks_diff(ticks_us(), t)
         else:
             self._dc(1)
             self._spi.write(self.buffer)
 
+        if not self.pace:
+            return
         frameTimeMs = 1000 // 60 # 60 FPS
         lastUpdateEnd = self.lastUpdateEnd
         frameTimeRemaining = frameTimeMs - ticks_diff(ticks_ms(), lastUpdateEnd)
@@ -193,8 +252,11 @@ class Grayscale:
             frameTimeRemaining = frameTimeMs - ticks_diff(ticks_ms(), lastUpdateEnd)
         self.lastUpdateEnd = ticks_ms()
 
-display = Grayscale()
-display_buffer = display.buffer
+if _HOST:
+    from hostdisplay import HostGrayscale
+    display = HostGrayscale()
+else:
+    display = Grayscale()
 display_update = display.update
 
 class _GrayscaleLauncher:
@@ -542,5 +604,6 @@ class _GrayscaleLauncher:
             ou += 1
             ol += 1
             x += 1
-_GrayscaleLauncher()
+if not _HOST:
+    _GrayscaleLauncher()
 del _GrayscaleLauncher
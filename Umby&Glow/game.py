@@ -1,15 +1,15 @@
 import gc
 gc.threshold(2000)
 gc.enable()
-from monsters import Monsters, Bones
+from monsters import Monsters, Bones, PORT
 gc.collect()
 from player import Player, bU, bD, bL, bR, bB, bA
 gc.collect()
-from display import display_update
+from display import display, display_update
 from tape import Tape
 gc.collect()
 from os import mkdir
-from time import ticks_ms
+from time import ticks_ms, ticks_us, ticks_add, ticks_diff, sleep_ms
 from audio import audio_tick
 from comms import comms, inbuf, outbuf
 from script import get_chapters, story_events, story_jump, state
@@ -17,6 +17,8 @@ import script
 gc.collect()
 
 _FPS = const(60)
+_FRAME_US = const(16667) # Simulation tick interval (microseconds)
+_MAX_SKIP = const(3) # Most frames in a row that can skip rendering
 
 tape = Tape()
 mons = Monsters(tape)
@@ -25,8 +27,9 @@ tape.mons_add = mons.add
 
 def _run_menu():
     handshake = held = t = 0
-    # Umby/Glow, 1P/2P, Text/Talk, Easy/Hard, New/Load, Chapter, selection
-    ch = [0, 0, 0, 0, 1, -1, 0]
+    # Umby/Glow, 1P/2P, Text/Talk, Easy/Hard, 60/30 FPS, New/Load, Chapter,
+    # selection
+    ch = [0, 0, 0, 0, 0, 1, -1, 0]
     story_jump(tape, mons, -999, False)
     mons.add(Bones, -970, 32)
     chapters = list(get_chapters())
@@ -36,32 +39,34 @@ def _run_menu():
         mons.tick(t)
         mons.draw_and_check_death(t, None, None)
         tape.auto_camera(mons.x[0], mons.y[0]-64, 1, t)
+        tape.tick()
         tape.comp()
         display_update()
         tape.clear_stage()
 
     def sel(i): # Menu arrows
         return (("_" if ch[i] else "<")
-            + (((("_-" if ch[i] else "-_")) if i == ch[6] else "__"))
+            + (((("_-" if ch[i] else "-_")) if i == ch[7] else "__"))
             + (">" if ch[i] else "_"))
 
     def update_main_menu():
-        ch[6] = (ch[6] + (1 if not bD() else -1 if not bU() else 0)) % 5
+        ch[7] = (ch[7] + (1 if not bD() else -1 if not bU() else 0)) % 6
         if not (bL() and bR()):
-            ch[ch[6]] = 0 if not bL() else 1
+            ch[ch[7]] = 0 if not bL() else 1
         msg = "UMBY_"+sel(0)+"_GLOW "
         msg += "__1P_"+sel(1)+"_2P__ "
         msg += "TEXT_"+sel(2)+"_TALK "
         msg += "EASY_"+sel(3)+"_HARD "
-        msg += "_NEW_"+sel(4)+"_LOAD"
+        msg += "60FPS"+sel(4)+"30FPS "
+        msg += "_NEW_"+sel(5)+"_LOAD"
         tape.clear_overlay()
         tape.message(0, msg, 3)
 
     def update_chapter_menu():
         if bU() and bD():
             return
-        ch[5] = (ch[5] + (-1 if not bU() else 1)) % len(chapters)
-        msg = chapters[ch[5]][0]
+        ch[6] = (ch[6] + (-1 if not bU() else 1)) % len(chapters)
+        msg = chapters[ch[6]][0]
         tape.clear_overlay()
         tape.message(0, msg, 3)
 
@@ -86,9 +91,9 @@ def _run_menu():
                     pass
                 sav = "/Saves/Umby&Glow-"+("glow" if ch[0] else "umby")+".sav"
                 # Find the starting position (of this player)
-                if ch[5] == -1:
+                if ch[6] == -1:
                     start = 3
-                    if ch[4]:
+                    if ch[5]:
                         try:
                             with open(sav, "r") as f:
                                 start = int(f.read()) - 145
@@ -96,7 +101,7 @@ def _run_menu():
                             pass
                     start = start if start > 3 else 3
                 else: # Chapter selection
-                    start = chapters[ch[5]][1]
+                    start = chapters[ch[6]][1]
                 menu = None
         background_update()
         t += 1
@@ -127,9 +132,20 @@ def _run_menu():
     tape.message(0, "GET READY!!...", 3)
     background_update()
     tape.clear_overlay()
-    return ch[0], clip, ch[1], ch[2], ch[3], start, sav
-glow, clip, coop, autotxt, hard, start, sav = _run_menu()
+    return ch[0], clip, ch[1], ch[2], ch[3], ch[4], start, sav
+glow, clip, coop, autotxt, hard, fps30, start, sav = _run_menu()
 del _run_menu
+if coop: # Each monster slot has its own entry in the coop message
+    mons.most = PORT
+    mons.size = min(mons.size, PORT)
+
+@micropython.native
+def _wait(nxt):
+    # Sleep until the next tick is due
+    while ticks_diff(nxt, ticks_us()) > 1000:
+        sleep_ms(1)
+    while ticks_diff(nxt, ticks_us()) > 0:
+        pass
 
 @micropython.native
 def run_game():
@@ -153,7 +169,10 @@ def run_game():
 
     # Main gameplay loop
     t = savst = coop_px = pstat = pstat2 = ptot = pfps1 = pfps2 = 0
+    skip = pskip = frm = 0
     pw = pw2 = pfpst = ticks_ms()
+    display.pace = False # Every tick is paced here instead
+    nxt = ticks_us()
     while(1):
         story_events(tape, mons, coop_px, autotxt, outbuf, inbuf)
         play = outbuf[14] and (not coop or inbuf[14])
@@ -184,12 +203,29 @@ def run_game():
         # Check for death by monster
         if play and ch(p1.x-tape.x[0], p1.y, 224):
             p1.die("Umby became monster food!")
-        # Draw the players
-        p1.draw(t)
-        p2.draw(t)
+        # Generate stale tape and carve blasts (even if not rendering)
+        tape.tick()
 
-        # Composite everything together to the render buffer
-        tape.comp()
+        # Keep the game ticking at a fixed rate, not rendering every other
+        # frame in 30 FPS mode, and skipping the rendering of the other
+        # frames while behind (up to _MAX_SKIP of them in a row).
+        nxt = ticks_add(nxt, _FRAME_US)
+        late = ticks_diff(ticks_us(), nxt) > 0
+        frm += 1
+        draw = not (fps30 and frm & 1)
+        if draw and late and skip < _MAX_SKIP:
+            skip += 1
+            pskip += 1
+            draw = False
+        elif draw:
+            if late: # Too far behind, so drop the lost time
+                nxt = ticks_us()
+            skip = 0
+            # Draw the players
+            p1.draw(t)
+            p2.draw(t)
+            # Composite everything together to the render buffer
+            tape.comp()
         audio_tick()
         if play:
             t += 1
@@ -201,21 +237,28 @@ def run_game():
             f.close()
             savst = state[0]
 
-        # Flush to the display, waiting on the next frame interval
-        if not prof:
+        if prof: # Speed profiling
+            pstat += ticks_ms() - pw
+            pfps1 += 1
+        # Wait on the next tick interval, and flush to the display
+        if not late:
+            _wait(nxt)
+        if draw:
             display_update()
+        if not prof:
             continue
-        # Or flush display with speed and memory profiling
-        pstat += ticks_ms() - pw
-        pfps1 += 1
-        display_update()
+        # Print the profiling every second
         if t % _FPS == 0:
             fpst = ticks_ms() - pfpst
             ptot += pstat
             gc.collect() # Full garbage collect for good memory use reading.
+            cst = tape.cache_stats
+            wait = display.wait_us
             print(pstat, ptot*_FPS//t, gc.mem_alloc(), gc.mem_free(), pstat2,
-                pfps1*1000//fpst, pfps2*1000//fpst, tape.x[0])
-            pstat = pstat2 = pfps1 = pfps2 = 0
+                pfps1*1000//fpst, pfps2*1000//fpst, tape.x[0], cst[0], cst[1],
+                wait[0]//1000, pskip, pstat*100//fpst)
+            pstat = pstat2 = pfps1 = pfps2 = cst[0] = cst[1] = wait[0] = 0
+            pskip = 0
             pfpst = ticks_ms()
         pw = ticks_ms()
 
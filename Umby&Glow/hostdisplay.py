@@ -0,0 +1,77 @@
+# Headless display for running the game off device
+# (e.g. with the MicroPython unix port) for profiling and benchmarking.
+# Frames are captured instead of being sent to a screen.
+# Environment variables select the capture:
+#     UG_FRAMES: path prefix for writing each frame to "{prefix}{n}.pgm"
+#         (or ".raw" with UG_FORMAT=raw), otherwise frames are kept in
+#         an in-memory ring of the last UG_RING (default 60) frames.
+#     UG_PACE: "fast" to run as fast as possible (default real-time 60 FPS).
+
+from utime import sleep_ms, ticks_diff, ticks_ms, ticks_us
+from os import getenv
+from array import array
+
+_WIDTH = const(72)
+_HEIGHT = const(40)
+_BUFF_SIZE = const((_HEIGHT // 8) * _WIDTH)
+# PGM gray for each colour (buffer bit + shading bit * 2):
+# black, white, dark gray, light gray.
+_grays = bytes([0, 255, 85, 170])
+
+class HostGrayscale:
+    def __init__(self, prefix=None, fmt=None, ring=None, fast=None):
+        self.drawBuffer = bytearray(_BUFF_SIZE*2)
+        self.buffer = memoryview(self.drawBuffer)[:_BUFF_SIZE]
+        self.shading = memoryview(self.drawBuffer)[_BUFF_SIZE:]
+        # Same profiling and settings attributes as Grayscale
+        self.sync = True
+        self.pace = True
+        self.wait_us = array('l', [0])
+        self.dirty = array('L', [-1]*((_BUFF_SIZE//4+31)//32))
+        self.lastUpdateEnd = 0
+        self.prefix = getenv("UG_FRAMES") if prefix is None else prefix
+        self.fmt = (getenv("UG_FORMAT") or "pgm") if fmt is None else fmt
+        self.fast = getenv("UG_PACE") == "fast" if fast is None else fast
+        ring = int(getenv("UG_RING") or 60) if ring is None else ring
+        # Captured frames (when not writing to files), oldest first
+        self.frames = [None]*ring
+        self.frame = 0 # Number of frames updated
+
+    def pgm(self, frame=None):
+        ''' Convert a draw buffer (default current) to a PGM image '''
+        buf = self.drawBuffer if frame is None else frame
+        img = bytearray(("P5 %d %d 255\n" % (_WIDTH, _HEIGHT)).encode())
+        hdr = len(img)
+        img.extend(bytes(_WIDTH*_HEIGHT))
+        for y in range(_HEIGHT):
+            r = (y >> 3)*_WIDTH
+            b = y & 7
+            for x in range(_WIDTH):
+                img[hdr + y*_WIDTH + x] = _grays[(buf[r+x] >> b & 1)
+                    | (buf[_BUFF_SIZE+r+x] >> b & 1) << 1]
+        return img
+
+    def update(self):
+        t = ticks_us()
+        if self.prefix:
+            raw = self.fmt == "raw"
+            with open("%s%05d.%s" % (self.prefix, self.frame,
+                    "raw" if raw else "pgm"), "wb") as f:
+                f.write(self.drawBuffer if raw else self.pgm())
+        else:
+            frames = self.frames
+            if frames:
+                frames.pop(0)
+                frames.append(bytes(self.drawBuffer))
+        for i in range(len(self.dirty)):
+            self.dirty[i] = -1
+        self.frame += 1
+        self.wait_us[0] += ticks_diff(ticks_us(), t)
+
+        if self.fast or not self.pace:
+            return
+        frameTimeMs = 1000 // 60 # 60 FPS
+        lastUpdateEnd = self.lastUpdateEnd
+        while ticks_diff(ticks_ms(), lastUpdateEnd) < frameTimeMs:
+            sleep_ms(1)
+        self.lastUpdateEnd = ticks_ms()
@@ -35,7 +35,7 @@ def _tick_falling_bones(self, t: int, i: int):
     if t%3==0:
         xs[i] += 1
     if ys[i] > 140:
-        ptr8(self._tids)[i] = 0
+        self._free(i)
     tape = self._tp
     ch = tape.check_tape
     x = xs[i]; y = ys[i]-64
@@ -43,4 +43,4 @@ def _tick_falling_bones(self, t: int, i: int):
         tape.blast(t, x, y)
         self._hit_monster(t, i, None)
 
-mons.ticks = {_Hoot: _tick_hoot, _FallingBones: _tick_falling_bones}
\ No newline at end of file
+mons.set_ticks({_Hoot: _tick_hoot, _FallingBones: _tick_falling_bones})
\ No newline at end of file
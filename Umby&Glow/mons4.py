@@ -214,9 +214,8 @@ def _tick_left_door(self, t: int, i: int):
 
     # Keep background monsters in range and falling
     if timer%(8-data[ii+1])==0:
-        for xi in range(48):
-            if tids[xi] != _BackBones:
-                continue
+        xi = int(self.find(_BackBones, -1))
+        while xi >= 0:
             if xs[xi] > x+88:
                 xs[xi] = x+88
             elif xs[xi] < x-8:
@@ -224,6 +223,7 @@ def _tick_left_door(self, t: int, i: int):
             if ys[xi] > 104:
                 ys[xi] = 74
             ys[xi] += data[ii+2]
+            xi = int(self.find(_BackBones, xi))
 
     # Flying sequence monster spawning
     if 2300 < timer < 10000 and timer%280==0:
@@ -237,7 +237,8 @@ def _tick_left_door(self, t: int, i: int):
         self.add(mon, x+x1-40, y1+64)
 
     # Stop monsters hogging the respawn area or charging for too long
-    xi = timer//2%48
+    slots = int(self.size)
+    xi = timer//2%slots
     if tids[xi] == _ChargingBones:
         if xs[xi] == p1x or ys[xi] == int(p1.y):
             if int(p1.mode) > 200:
@@ -245,7 +246,7 @@ def _tick_left_door(self, t: int, i: int):
                     xs[xi] += 30 if xi%2 else -30
                 else:
                     ys[xi] += 30 if xi//2%2 else -30
-            tids[xi] = _Bones
+            self._retype(xi, _Bones)
             data[xi*5+4] = 2
     # Keep monsters in area
     if tids[xi] == _Bones:
@@ -261,17 +262,15 @@ def _tick_left_door(self, t: int, i: int):
             tape.blast(timer//5,
                 (timer^p1x)%216+int(self.x[i])-72, (timer*p1x)%64)
         # Clearing out background monsters
-        if tids[timer%48] != _LeftDoor:
-            tids[timer%48] = 0
-            self.num = int(self.num) - 1 <<1|1
+        if tids[timer%slots] != _LeftDoor:
+            self._free(timer%slots)
     elif timer == 11300:
-        tids[i] = 0
-        self.num = int(self.num) - 1 <<1|1
+        self._free(i)
 
-mons.ticks = {
+mons.set_ticks({
     _LeftDoor: _tick_left_door,
     999: _left_door_events,
     9991: pattern_door,
     9992: pattern_windows,
     9993: pattern_inside,
-}
\ No newline at end of file
+})
\ No newline at end of file
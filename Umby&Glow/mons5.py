@@ -22,4 +22,4 @@ def _tick_e_falcon(self, t: int, i: int):
     if ti%5==0: # Up/Down
         ys[i] = 60 + (yy + (1 if (x+ti%600//300)%2 else -1))%72
 
-mons.ticks = {_EFalcon: _tick_e_falcon}
\ No newline at end of file
+mons.set_ticks({_EFalcon: _tick_e_falcon})
\ No newline at end of file
@@ -48,6 +48,6 @@ def _tick_flood(self, t: int, i: int):
     self._tp.redraw_tape(2, t*10+t//10%300, self.ticks[9991], None)
     self.data[i*5] += 1
     if self.data[i*5] > 600:
-        self._tids[i] = 0
+        self._free(i)
 
-mons.ticks = {_CPU: _tick_cpu, _Flood: _tick_flood, 9991: pattern_flood}
\ No newline at end of file
+mons.set_ticks({_CPU: _tick_cpu, _Flood: _tick_flood, 9991: pattern_flood})
\ No newline at end of file
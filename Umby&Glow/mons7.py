@@ -5,16 +5,17 @@ def _tick_lung(self, t, i):
     x = self.x[i]
     tape = self._tp
     if tape.player.x > x+300:
-        self._tids[i] = 0
+        self._free(i)
     if tape.player.x > x-17:
         self.bsync = 1
     data = self.data
     if data[i*5]: return
     self.y[i] = 105
     if self.bsync or self.omons.bsync:
-        for j, m in enumerate(self._tids):
-            if m == _Hold:
-                self._kill(t, j, None, None)
-                data[i*5] = 1
+        j = self.find(_Hold, -1)
+        while j >= 0:
+            self._kill(t, j, None, None)
+            data[i*5] = 1
+            j = self.find(_Hold, j)
 
-mons.ticks = {_Lung: _tick_lung}
\ No newline at end of file
+mons.set_ticks({_Lung: _tick_lung})
\ No newline at end of file
@@ -65,7 +65,11 @@ Hold = _Hold
 boss_types = [_BonesBoss, _DragonBones, _LeftDoor, _CPU, _Hold, _TankPillar,
     _MegaBones, _MiniShake, _Shake, _BigShake, _SuperShake]
 
-_data = array('l', 0 for i in range(48*5))
+_MONS = const(96) # Monster slots (the most any level can use)
+_PORT = const(48) # Monsters sent to the coop player each message
+PORT = _PORT
+
+_data = array('l', 0 for i in range(_MONS*5))
 
 class Monsters:
     # BITMAP: width: 7, height: 8, frames: 3
@@ -148,6 +152,51 @@ class Monsters:
     _cerebral_w = bytearray([16,23,25,20,8])
     _cerebral_x = bytearray([8,1,0,8,30])
 
+    # Art for the simple sprites (as indexed by the sprite table)
+    _sprite_art = (_bones, _bones_m, _skittle, _skittle_m, _fireball,
+        _fireball_m, _stomper, _stomper_m, _pillar_head, _pillar_head_m,
+        _pillar_tail, _pillar_tail_m)
+    # Sprite table rows for simple monsters (drawn by draw_and_check_death):
+    # [art, mask art, art width, mask width, art x offset, art y offset,
+    #  mask x offset, mask y offset, frame, flags] with offsets +16.
+    # Flags: 1 - blink frames (for Bones), 2 - mask the back layer too.
+    _sprites = bytearray([
+        0,1,7,9,13,12,12,12,0,3, # Bones
+        0,1,7,9,13,12,12,12,2,2, # BonesBoss/DragonBones/Charging/Falling
+        2,3,8,9,16,12,15,12,0,0, # Skittle
+        4,5,8,8,16,12,16,12,0,0, # Fireball
+        6,7,7,7,13,19,13,19,0,0, # Stomper
+        8,9,7,7,13,12,13,12,0,0, # Pillar
+        10,11,7,7,13,12,13,12,0,0]) # PillarTail
+    # Sprite table row+1 for each monster type (0 for bespoke drawing)
+    _sprite_rows = bytearray(100)
+    _sprite_rows[_Bones] = 1
+    for _t in (_BonesBoss, _DragonBones, _ChargingBones, _ChargingBonesFriend,
+            _FallingBones):
+        _sprite_rows[_t] = 2
+    _sprite_rows[_Skittle] = 3
+    _sprite_rows[_Fireball] = 4
+    _sprite_rows[_Stomper] = 5
+    _sprite_rows[_Pillar] = 6
+    _sprite_rows[_PillarTail] = 7
+    # Hitbox for each monster type hit by rockets:
+    # [x offset, y offset, width, height] with offsets +16. Monsters with
+    # no hitbox (height 0) are checked against their drawn pixels instead.
+    _hitboxes = bytearray(400)
+    for _t in range(100):
+        if _sprite_rows[_t]: # Simple sprites hit on their art
+            _r = _sprite_rows[_t]*10-10
+            _hitboxes[_t*4] = _sprites[_r+4]
+            _hitboxes[_t*4+1] = _sprites[_r+5]
+            _hitboxes[_t*4+2] = _sprites[_r+2]
+            _hitboxes[_t*4+3] = 8
+    for _t, _r in ((_Wyvern, b'\x0d\x0c\x07\x08'),
+            (_Lazer, b'\x10\x0c\x08\x08'), (_Hoot, b'\x0c\x0b\x09\x08'),
+            (_EFalcon, b'\x0d\x0c\x06\x08')):
+        for _i in range(4):
+            _hitboxes[_t*4+_i] = _r[_i]
+    del _t, _r, _i
+
     def __init__(self, tape):
         self._tp = tape
         self.data = _data
@@ -155,17 +204,78 @@ class Monsters:
         # x pos for left edge of the active tape area of coop, otherwise own
         self._px = 0
         # Types of all the monsters
-        self._tids = bytearray(0 for i in range(48))
+        self._tids = bytearray(0 for i in range(_MONS))
         # x positions of all the monsters
-        self.x = array('l', 0 for i in range(48))
+        self.x = array('l', 0 for i in range(_MONS))
         # y positions start at 64 pixels above top of screen
-        self.y = bytearray(0 for i in range(48))
+        self.y = bytearray(0 for i in range(_MONS))
         # Number of monsters active (local monsters only)
         self.num = 0
+        # Most monsters active at once (set by each level), and the most
+        # a level can set (PORT in coop, as each slot is sent in its own
+        # entry of the coop message).
+        self.size = 48
+        self.most = _MONS
+        # Slots of the active monsters (in slot order), and the stack
+        # of free slots (lowest slot on top), with their counts [act, free].
+        self._act = bytearray(_MONS)
+        self._fre = bytearray(_MONS-1-i for i in range(_MONS))
+        self._cnt = bytearray([0, _MONS])
+        # Shots that can hit monsters this frame, as [x, y, player] for each
+        # (player 1 or 2, and 0 once the shot is used up).
+        self._shots = array('l', 0 for i in range(6))
+        # Slots of each monster type, as a bit set of 12 bytes per type
+        # (kept by _retype, for finding the members of a swarm or boss).
+        self._sets = bytearray(100*12)
+        # Chain links (Pillar/DragonBones/Wyvern) to the next section
+        # towards the tail, and back towards the head (slot+1, 0 for none).
+        self._link = bytearray(_MONS)
+        self._back = bytearray(_MONS)
         # Dialog from worms in reaction to monster events
         self.reactions = []
         self.bsync = 0
         self.omons = None
+        # Tick dispatch table for each monster type: behavior function,
+        # tick rate divisor (0 for no behavior), and phase of the divisor.
+        self._tick_fns = [None]*100
+        self._tick_div = bytearray(100)
+        self._tick_ph = bytearray(100)
+        self.set_ticks(None)
+
+    def set_ticks(self, ticks):
+        # Set the extra loadable monster behavior (from mons{N}.py),
+        # rebuilding the tick dispatch table with the built in behaviors.
+        self.ticks = ticks
+        fns = self._tick_fns
+        div = self._tick_div
+        ph = self._tick_ph
+        for i in range(100):
+            fns[i] = None
+            div[i] = ph[i] = 0
+        M = Monsters
+        for typs, fn, d, p in (
+                ((_Bones, _BackBones), M._tick_bones, 2, 0),
+                ((_BonesBoss,), M._tick_bones_boss, 1, 0),
+                ((_DragonBones, _Wyvern), M._tick_dragon_bones, 1, 0),
+                ((_ChargingBones, _ChargingBonesFriend),
+                    M._tick_bones_charging, 4, 1),
+                ((_Skittle, _Fireball, _Lazer), M._tick_fly_left, 2, 1),
+                ((_Stomper,), M._tick_stomper, 1, 0),
+                (range(_Molaar, _Pillar+1), M._tick_crawler, 3, 0),
+                ((_Prober,), M._tick_prober, 1, 0),
+                (range(_MiniShake, _SuperShake+1), M._tick_shakes, 1, 0)):
+            for typ in typs:
+                fns[typ] = fn
+                div[typ] = d
+                ph[typ] = p
+        # Loaded behaviors are called every tick, for the types without
+        # a built in behavior (other keys are extras)
+        if ticks:
+            for typ, fn in ticks.items():
+                if typ < 100 and fns[typ] is None:
+                    fns[typ] = fn
+                    div[typ] = 1
+                    ph[typ] = 0
 
     @micropython.viper
     def port_out(self, buf: ptr8):
@@ -174,16 +284,21 @@ class Monsters:
         tids = ptr8(self._tids)
         xs = ptr32(self.x)
         ys = ptr8(self.y)
+        act = ptr8(self._act)
         buf[15] = int(self.bsync)
-        for i in range(48):
+        for i in range(_PORT):
+            buf[16+i*3] = 0 # Disable monster (not active)
+        # Each slot is sent in its own entry, so the coop player has the
+        # same slots (levels use at most _PORT monsters in coop).
+        for k in range(ptr8(self._cnt)[0]):
+            i = act[k]
             x = xs[i]
-            # Add monster to buffer (disabling if out of range)
-            buf[16+i*3] = tids[i] if 0 < x-px <= 256 else 0
-            buf[17+i*3] = x-px if 0 < x-px <= 256 else 0
+            if i >= _PORT or not 0 < x-px <= 256:
+                continue # Out of range
+            # Add monster to buffer
+            buf[16+i*3] = tids[i]
+            buf[17+i*3] = x-px
             buf[18+i*3] = ys[i]
-        # Clear remainder of buffer
-        for i in range(i+1, 48):
-            buf[16+i*3] = 0 # Disable monster (not active)
 
     @micropython.viper
     def port_in(self, buf: ptr8):
@@ -194,11 +309,36 @@ class Monsters:
         xs = ptr32(self.x)
         ys = ptr8(self.y)
         self.bsync = buf[15] <<1|1
-        for i in range(48):
-            tids[i] = tid = buf[16+i*3]
+        act = ptr8(self._act)
+        fre = ptr8(self._fre)
+        sets = ptr8(self._sets)
+        lnk = ptr8(self._link)
+        bck = ptr8(self._back)
+        n = 0
+        for i in range(_PORT):
+            tid = buf[16+i*3]
+            # Move the slot to the set for its new type
+            m = 1 << (i & 7)
+            if tids[i]:
+                sets[tids[i]*12 + (i>>3)] &= 255-m
+            if tid:
+                sets[tid*12 + (i>>3)] |= m
+            tids[i] = tid
+            lnk[i] = bck[i] = 0 # Chains aren't sent
             if tid:
                 xs[i] = buf[17+i*3]+px
                 ys[i] = buf[18+i*3]
+                act[n] = i
+                n += 1
+        # Rebuild the free slots from the received monsters
+        f = 0
+        for i in range(_MONS-1, -1, -1):
+            if tids[i] == 0:
+                fre[f] = i
+                f += 1
+        cnt = ptr8(self._cnt)
+        cnt[0] = n
+        cnt[1] = f
 
     @micropython.native
     def is_alive(self, mon):
@@ -211,15 +351,23 @@ class Monsters:
         xs = ptr32(self.x)
         ys = ptr8(self.y)
         d = ptr32(_data)
-        # Find the next monster slot
-        for i in range(48):
-            if tids[i] == 0:
-                break
-        else: # Monster buffer full
+        # Take the lowest free monster slot
+        cnt = ptr8(self._cnt)
+        if cnt[1] == 0 or cnt[0] >= int(self.size): # Monster buffer full
             return -1
+        cnt[1] -= 1
+        i = ptr8(self._fre)[cnt[1]]
+        # Insert into the active monsters (keeping slot order)
+        act = ptr8(self._act)
+        j = cnt[0]
+        while j > 0 and act[j-1] > i:
+            act[j] = act[j-1]
+            j -= 1
+        act[j] = i
+        cnt[0] += 1
         # Create the new monster
-        self.num = (int(self.num)+1) <<1|1
-        tids[i] = tid
+        self.num = cnt[0] <<1|1
+        self._retype(i, tid)
         xs[i] = x; ys[i] = y+64
         ii = i*5
         d[ii] = d[ii+1] = d[ii+2] = d[ii+3] = d[ii+4] = 0
@@ -236,15 +384,20 @@ class Monsters:
         elif tid == _Stomper:
             d[ii] = y*16
         elif tid == _Pillar or _DragonBones <= tid <= _Wyvern:
-            # Make all the sections in the chain
+            # Make all the sections in the chain, linking each new
+            # section (in higher slots) to the previous one as its tail
+            lnk = ptr8(self._link)
+            bck = ptr8(self._back)
             k = i
             for j in range(16 if tid == _DragonBones else 5):
                 kn = int(self.add(_PillarTail, x, y))
                 if kn > k:
+                    lnk[kn] = k+1
+                    bck[k] = kn+1
                     k = kn
             # Swap the tail for the head is protected by body.
-            tids[i] = _PillarTail
-            tids[k] = tid
+            self._retype(i, _PillarTail)
+            self._retype(k, tid)
             if tid == _Pillar:
                 # Set the turn direction (1=clockwise)
                 d[k*5+1] = x%2
@@ -272,10 +425,86 @@ class Monsters:
     @micropython.viper
     def clear(self):
         tids = ptr8(self._tids)
-        for i in range(48):
+        fre = ptr8(self._fre)
+        lnk = ptr8(self._link)
+        bck = ptr8(self._back)
+        for i in range(_MONS):
             tids[i] = 0
+            fre[i] = _MONS-1-i
+            lnk[i] = bck[i] = 0
+        sets = ptr8(self._sets)
+        for i in range(100*12):
+            sets[i] = 0
+        cnt = ptr8(self._cnt)
+        cnt[0] = 0
+        cnt[1] = _MONS
         self.num = 0 <<1|1
 
+    @micropython.viper
+    def _free(self, i: int):
+        # Remove a monster, returning its slot to the free stack
+        tids = ptr8(self._tids)
+        if tids[i] == 0:
+            return
+        self._retype(i, 0)
+        # Take the section out of any chain
+        lnk = ptr8(self._link)
+        bck = ptr8(self._back)
+        if bck[i]:
+            lnk[bck[i]-1] = lnk[i]
+        if lnk[i]:
+            bck[lnk[i]-1] = bck[i]
+        lnk[i] = bck[i] = 0
+        cnt = ptr8(self._cnt)
+        act = ptr8(self._act)
+        fre = ptr8(self._fre)
+        n = cnt[0]
+        j = 0
+        while j < n and act[j] != i:
+            j += 1
+        if j == n: # Not a local monster
+            return
+        while j < n-1:
+            act[j] = act[j+1]
+            j += 1
+        cnt[0] = n-1
+        self.num = n-1 <<1|1
+        # Push the slot, keeping the lowest slots on top
+        j = cnt[1]
+        while j > 0 and fre[j-1] < i:
+            fre[j] = fre[j-1]
+            j -= 1
+        fre[j] = i
+        cnt[1] += 1
+
+    @micropython.viper
+    def _retype(self, i: int, tid: int):
+        # Change the type of a monster (0 to remove it from the sets only),
+        # keeping the per type sets up to date.
+        tids = ptr8(self._tids)
+        sets = ptr8(self._sets)
+        m = 1 << (i & 7)
+        if tids[i]:
+            sets[tids[i]*12 + (i>>3)] &= 255-m
+        if tid:
+            sets[tid*12 + (i>>3)] |= m
+        tids[i] = tid
+
+    @micropython.viper
+    def find(self, tid: int, i: int) -> int:
+        # Next slot after slot i with a monster of the type, or -1
+        sets = ptr8(self._sets)
+        i += 1
+        while i < _MONS:
+            m = sets[tid*12 + (i>>3)] >> (i & 7)
+            if m == 0:
+                i = (i|7)+1 # No more in this byte
+            elif m & 1:
+                return i
+            else:
+                i += 1
+        return -1
+
     @micropython.viper
     def tick(self, t: int):
         tape = self._tp
@@ -285,37 +514,35 @@ class Monsters:
         # Loop through all the monsters, updating ticks
         tids = ptr8(self._tids)
         xs = ptr32(self.x)
-        for i in range(48):
-            if tids[i] == 0:
-                continue
+        act = ptr8(self._act)
+        cnt = ptr8(self._cnt)
+        fns = self._tick_fns
+        div = ptr8(self._tick_div)
+        ph = ptr8(self._tick_ph)
+        k = 0
+        i = -1
+        while 1:
+            # Find the next active monster slot (after slot i), allowing
+            # for monsters being added and removed along the way.
+            while k > 0 and act[k-1] > i:
+                k -= 1
+            while k < cnt[0] and act[k] <= i:
+                k += 1
+            if k >= cnt[0]:
+                break
+            i = act[k]
             # Check for standard death conditions
             if xs[i] < tpx - 72: # Too far left, destroy monster
                 self._hit_monster(t, i, None)
-            # Handle each monster type #
+            # Handle each monster type (when due on this tick)
             typ = tids[i]
-            if _Bones <= typ <= _BackBones and t%2==0:
-                self._tick_bones(t, i)
-            elif typ == _BonesBoss:
-                self._tick_bones_boss(t, i)
-            elif _DragonBones <= typ <= _Wyvern:
-                self._tick_dragon_bones(t, i)
-            elif _ChargingBones <= typ <= _ChargingBonesFriend and t%4==1:
-                self._tick_bones_charging(t, i)
-            elif (_Skittle <= typ <= _Lazer) and t%2:
-                xs[i] -= 1 # Just fly straight left
-            elif typ == _Stomper:
-                self._tick_stomper(t, i)
-            elif _Molaar <= typ <= _Pillar and t%3==0:
-                self._tick_crawler(t, i)
-            elif typ == _Prober:
-                self._tick_prober(t, i)
-            elif _MiniShake <= typ <= _SuperShake:
-                self._tick_shakes(t, i)
-            ## Dynamically loaded behaviors
-            elif self.ticks:
-                tic = self.ticks.get(typ, None)
-                if tic:
-                    tic(self, t, i)
+            d = div[typ]
+            if d and t%d == ph[typ]:
+                fns[typ](self, t, i)
+
+    @micropython.viper
+    def _tick_fly_left(self, t: int, i: int):
+        ptr32(self.x)[i] -= 1 # Just fly straight left
 
     @micropython.viper
     def _tick_stomper(self, t: int, i: int):
@@ -360,9 +587,9 @@ class Monsters:
             p2x = int(plyrs[1].x) if p2 else 0
             p2y = int(plyrs[1].y) if p2 else 0
             if p1 and (p1x-x)*(p1x-x) + (p1y-y)*(p1y-y) < 300:
-                tids[i] = _ChargingBones
+                self._retype(i, _ChargingBones)
             if p2 and (p2x-x)*(p2x-x) + (p2y-y)*(p2y-y) < 300:
-                tids[i] = _ChargingBonesFriend
+                self._retype(i, _ChargingBonesFriend)
 
     @micropython.viper
     def _tick_bones_boss(self, t: int, i: int):
@@ -378,9 +605,8 @@ class Monsters:
         if t%2:
             ci = 0
             # Swarm minions around boss
-            for j in range(48):
-                if tids[j] != _Bones:
-                    continue
+            j = int(self.find(_Bones, -1))
+            while j >= 0:
                 ci += 1
                 dx = data[j*5+2]
                 xj = xs[j]; yj = ys[j]-64
@@ -395,6 +621,7 @@ class Monsters:
                     # Move towards position just behind minion
                     xs[i] += -1 if xj < x-10 else 1
                     ys[i] += -1 if yj < y else 1
+                j = int(self.find(_Bones, j))
             # Spawn starting minions and slowly spawn in fresh monsters
             if (ci < 10 and t%180==1) or (t%15==0 and data[ii+4] > 0):
                 data[ii+4] -= 1
@@ -419,23 +646,22 @@ class Monsters:
             self._tick_bones_charging(t, i)
         oy = -4 # Neck bend
         # Move the tail
-        ht = 0 # has tail?
+        lnk = ptr8(self._link)
+        ht = lnk[i] # has tail?
         mon = i
-        for j in range(i-1, -1, -1):
-            if tids[j] == _Pillar or _DragonBones <= tids[j] <= _Wyvern:
-                break # Another head, we are done on this chain
-            elif tids[j] == _PillarTail:
-                s = (s+1)%2 # Alternating sections move
-                if s: # Follow the head, in a chain
-                    d = xs[i]-xs[j]
-                    xs[j] += 1 if d > 0 else -1 if d < 0 else 0
-                    d = ys[i]-ys[j] + oy
-                    oy = 0
-                    ys[j] += 1 if d > 0 else -1 if d < 0 else 0
-                i = j # Each section follows the other
-                ht = 1
+        j = lnk[i]-1
+        while j >= 0:
+            s = (s+1)%2 # Alternating sections move
+            if s: # Follow the head, in a chain
+                d = xs[i]-xs[j]
+                xs[j] += 1 if d > 0 else -1 if d < 0 else 0
+                d = ys[i]-ys[j] + oy
+                oy = 0
+                ys[j] += 1 if d > 0 else -1 if d < 0 else 0
+            i = j # Each section follows the other
+            j = lnk[j]-1
         if ht==0: # Switch to charging bones if no tail
-            tids[mon] = _ChargingBones
+            self._retype(mon, _ChargingBones)
 
     @micropython.viper
     def _tick_bones_charging(self, t: int, i: int):
@@ -464,7 +690,6 @@ class Monsters:
         tid = tids[i]
         xs = ptr32(self.x); ys = ptr8(self.y)
         x = xs[i]; y = ys[i]-64
-        ch = self._tp.check_tape
         data = ptr32(_data)
         ii = i*5
         s = t//30%2 # every other section moves, alternatively
@@ -472,7 +697,9 @@ class Monsters:
         if s or tid != _Pillar:
             d = data[ii] # direction of movement (down:0/left:1/up:2/right:3)
             r = data[ii+1] # rotation direction
-            if ch(x, y): # Try to find an edge from within solid foreground
+            # Solid foreground around the head (3x3 from x-1, y-1)
+            bx = int(self._tp.check_box(x-1, y-1, 3, 3))
+            if bx >> 4 & 1: # Try to find an edge from within solid foreground
                 xs[i] -= 1 if tid==_Pillar or t%30==0 else 0
                 ys[i] += -1 if t%360<180 and y > 1 else 1 if y < 62 else 0
             else:
@@ -489,8 +716,9 @@ class Monsters:
                     spx = spx if npx else 0-spx
                     spy = spy if npy else 0-spy
                 # Crawl around edges of platforms, or search for edges
-                cp = ch(x+npx, y+npy)
-                if not cp and (ch(x+spx, y+spy) or not ch(x+tpy, y+tpx)):
+                cp = bx >> (npx*3+npy+4) & 1
+                if not cp and (bx >> (spx*3+spy+4) & 1
+                        or not bx >> (tpy*3+tpx+4) & 1):
                     # Move in direction facing
                     xs[i] += npx
                     ys[i] += npy
@@ -521,28 +749,29 @@ class Monsters:
         if _Molaar <= tid <= _MolaarClimbingCharging:
             _old_tid = tids[i]
             if t%4==0:
-                tids[i] = (_Molaar if d<=1 else _MolaarClimbing if d==2
+                tid = (_Molaar if d<=1 else _MolaarClimbing if d==2
                     else _MolaarHanging)
                 # Update charging
                 if (t+data[ii+2])%360<50:
-                    tids[i] += 3
+                    tid += 3
                 elif _old_tid > _MolaarClimbing:
                     # Released charge - launch fireball
                     self.add(_Fireball, x-9, y +
                         (3 if _old_tid==_MolaarHangingCharging else -4))
+                self._retype(i, tid)
             return
         # Move the tail (for Pillar)
-        for j in range(i-1, -1, -1):
-            if tids[j] == _Pillar or _DragonBones <= tids[j] <= _Wyvern:
-                break # Another head, we are done on this chain
-            elif tids[j] == _PillarTail:
-                s = (s+1)%2 # Alternating sections move
-                if s: # Follow the head, in a chain
-                    d = xs[i]-xs[j]
-                    xs[j] += 1 if d > 0 else -1 if d < 0 else 0
-                    d = ys[i]-ys[j]
-                    ys[j] += 1 if d > 0 else -1 if d < 0 else 0
-                i = j # Each section follows the other
+        lnk = ptr8(self._link)
+        j = lnk[i]-1
+        while j >= 0:
+            s = (s+1)%2 # Alternating sections move
+            if s: # Follow the head, in a chain
+                d = xs[i]-xs[j]
+                xs[j] += 1 if d > 0 else -1 if d < 0 else 0
+                d = ys[i]-ys[j]
+                ys[j] += 1 if d > 0 else -1 if d < 0 else 0
+            i = j # Each section follows the other
+            j = lnk[j]-1
 
     @micropython.viper
     def _tick_prober(self, t: int, i: int):
@@ -575,13 +804,13 @@ class Monsters:
                 data[ii] = 0
             # Fire
             if data[ii] == 90:
-                tids[i] = _Probing
+                self._retype(i, _Probing)
 
     def _tick_shakes(self, t, i):
         self.data[i*5] += 1
         if self.data[i*5] > 60*(self._tids[i]-91):
             self._tp.cam_shake = 0
-            self._tids[i] = 0
+            self._free(i)
 
     @micropython.viper
     def draw_and_check_death(self, t: int, p1, p2):
@@ -589,8 +818,9 @@ class Monsters:
         ch = tape.check
         tpx = int(tape.x[0])
         px = int(self._px) - tpx
-        # Extract the states and positions of the rockets
-        r1 = r2 = 0
+        # Extract the shots from the rockets (in range of being hit)
+        shots = ptr32(self._shots)
+        n = 0
         if p1:
             r1 = int(p1.rocket_on)
             r1x = int(p1.rocket_x)-tpx
@@ -601,35 +831,119 @@ class Monsters:
                 r1 = 1
                 r1x = int(p1.x)-tpx
                 r1y = int(p1.y)
+            if r1 and -30 <= r1x < 102:
+                shots[0] = r1x; shots[1] = r1y; shots[2] = 1
+                n = 1
         if p2:
-            r2 = int(p2.rocket_on)
             r2x = int(p2.rocket_x)-tpx
-            r2y = int(p2.rocket_y)
-        # Loop through all active monsters, to draw and check for monster death
+            if int(p2.rocket_on) and -30 <= r2x < 102:
+                shots[n*3] = r2x; shots[n*3+1] = int(p2.rocket_y)
+                shots[n*3+2] = 2
+                n += 1
+        # Check the shots against the monster hitboxes
+        if n:
+            self._check_hits(t, n, p1, p2)
+        # Loop through all active monsters, to draw (and check monsters
+        # with no hitbox for death)
         tids = ptr8(self._tids)
         xs = ptr32(self.x)
         ys = ptr8(self.y)
-        for i in range(48):
-            if tids[i] == 0:
-                continue
+        act = ptr8(self._act)
+        cnt = ptr8(self._cnt)
+        rows = ptr8(self._sprite_rows)
+        spr = ptr8(self._sprites)
+        hbs = ptr8(self._hitboxes)
+        art = self._sprite_art
+        k = 0
+        i = -1
+        while 1:
+            # Next active monster slot (after slot i, as with tick)
+            while k > 0 and act[k-1] > i:
+                k -= 1
+            while k < cnt[0] and act[k] <= i:
+                k += 1
+            if k >= cnt[0]:
+                break
+            i = act[k]
             x = xs[i]-tpx
+            tid = tids[i]
+            box = hbs[tid*4+3]
+            if box and not -16 < x < 88:
+                continue # Off screen, with no need to draw for hits
             # Coop's monsters in the distance get drawn to background layers
             l = 1 if 36 <= x-px < 174 or self.omons else 0
-            if tids[i] < _Hoot:
-                draw = self._draw_monsters_a
-            elif tids[i] < _TankPillar:
-                draw = self._draw_monsters_b
+            r = rows[tid]
+            if r: # Simple sprite (from the sprite table)
+                s = r*10-10
+                y = ys[i]-64
+                msk = art[spr[s+1]]
+                pf = spr[s+8]
+                f = spr[s+9]
+                if f & 1:
+                    pf = 0 if t//10 % 6 else 1
+                if f & 2:
+                    tape.mask(0, spr[s+6]-16, spr[s+7]-16, msk, 9, 0)
+                tape.draw(l, x+spr[s+4]-16, y+spr[s+5]-16, art[spr[s]],
+                    spr[s+2], pf)
+                tape.mask(l, x+spr[s+6]-16, y+spr[s+7]-16, msk, spr[s+3], 0)
             else:
-                draw = self._draw_monsters_c
-            draw(t, i, tids[i], x, ys[i]-64, l)
-            # Check if a rocket hits this monster
-            if r1 and ch(r1x, r1y, 224):
-                self._hit_monster(t, i, p1)
-                r1 = 0 # Done with this rocket
-            # Check if ai helper's rocket hits the monster
-            elif r2 and ch(r2x, r2y, 224):
-                self._hit_monster(t, i, p2)
-                r2 = 0 # Done with this rocket
+                if tid < _Hoot:
+                    draw = self._draw_monsters_a
+                elif tid < _TankPillar:
+                    draw = self._draw_monsters_b
+                else:
+                    draw = self._draw_monsters_c
+                draw(t, i, tid, x, ys[i]-64, l)
+            if box or n == 0:
+                continue
+            # Check if a shot hits the drawn monster
+            for j in range(0, n*3, 3):
+                if shots[j+2] and ch(shots[j], shots[j+1], 224):
+                    self._hit_monster(t, i, p1 if shots[j+2] == 1 else p2)
+                    shots[j+2] = 0 # Done with this shot
+                    break
+
+    @micropython.viper
+    def _check_hits(self, t: int, n: int, p1, p2):
+        # Collide the shots with the hitboxes of the monsters (in slot
+        # order), with each shot hitting at most one monster.
+        shots = ptr32(self._shots)
+        tids = ptr8(self._tids)
+        xs = ptr32(self.x)
+        ys = ptr8(self.y)
+        act = ptr8(self._act)
+        cnt = ptr8(self._cnt)
+        hbs = ptr8(self._hitboxes)
+        tpx = int(self._tp.x[0])
+        px = int(self._px) - tpx
+        om = 1 if self.omons else 0
+        k = 0
+        i = -1
+        while 1:
+            while k > 0 and act[k-1] > i:
+                k -= 1
+            while k < cnt[0] and act[k] <= i:
+                k += 1
+            if k >= cnt[0]:
+                break
+            i = act[k]
+            b = tids[i]*4
+            x = xs[i]-tpx
+            # Only monsters drawn on the foreground can be hit
+            if hbs[b+3] == 0 or not (om or 36 <= x-px < 174):
+                continue
+            x += hbs[b]-16
+            y = ys[i]-64+hbs[b+1]-16
+            w = hbs[b+2]
+            h = hbs[b+3]
+            for j in range(0, n*3, 3):
+                # Shots are 3 pixels tall, up from their position
+                sy = shots[j+1]
+                if (shots[j+2] and x <= shots[j] < x+w
+                        and y < sy and sy-3 < y+h):
+                    self._hit_monster(t, i, p1 if shots[j+2] == 1 else p2)
+                    shots[j+2] = 0 # Done with this shot
+                    break
 
     @micropython.viper
     def _draw_monsters_a(self, t: int, i: int, tid: int, x: int, y: int, l: int):
@@ -638,36 +952,23 @@ class Monsters:
         mx = px = -3
         my = py = -4
         mw = pw = 8
-        if _Bones <= tid <= _FallingBones:
-            pf = 2 if not _Bones <= tid <= _BackBones else 0 if t//10 % 6 else 1
-            img = self._bones; msk = self._bones_m
+        # (Most Bones, Skittle, Fireball, Stomper, and Pillar are drawn from
+        # the sprite table in draw_and_check_death)
+        if tid == _BackBones:
+            tape.draw(0, x+px, y+py, self._bones, 7, 0 if t//10 % 6 else 1)
+            return
+        elif tid == _Wyvern:
+            img = self._prober; msk = self._bones_m
+            pf = t//30%2
             pw = 7
             mx = -4
             mw = 9
-            if tid == _BackBones:
-                tape.draw(0, x+px, y+py, img, pw, pf)
-                return
-            elif tid == _Wyvern:
-                img = self._prober
-                pf = t//30%2
-                tape.draw(0, x+px, y+py, img, 7, 1-pf)
+            tape.draw(0, x+px, y+py, img, 7, 1-pf)
             tape.mask(0, mx, my, msk, 9, 0) # Mask Back
-        elif tid == _Skittle:
-            img = self._skittle; msk = self._skittle_m
-            px = 0
-            mx = -1
-            mw = 9
-        elif tid == _Fireball:
-            img = self._fireball; msk = self._fireball_m
-            px = mx = 0
         elif tid == _Lazer:
             img = self._lazer; msk = self._lazer_m
             px = mx = 0
             tape.draw(0, x+1, y+py, self._lazer_shd, 3, 0)
-        elif tid == _Stomper:
-            img = self._stomper; msk = self._stomper_m
-            my = py = 3
-            mw = pw = 7
         elif _Molaar <= tid <= _MolaarClimbingCharging:
             img = self._molaar_feet; msk = self._molaar_feet_m
             mw = pw = 6
@@ -685,12 +986,6 @@ class Monsters:
             hpf = 0 if tid==_Molaar else 1
             hpy += 1 if t%20<6 else 0 # Gait
             tape.draw(l, x+3, y+hpy, self._molaar_tail, 4, hpf)
-        elif tid == _Pillar:
-            img = self._pillar_head; msk = self._pillar_head_m
-            mw = pw = 7
-        elif tid == _PillarTail:
-            img = self._pillar_tail; msk = self._pillar_tail_m
-            mw = pw = 7
         else:
             return
         tape.draw(l, x+px, y+py, img, pw, pf)
@@ -808,8 +1103,7 @@ class Monsters:
     @micropython.viper
     def _kill(self, t: int, mon: int, player, tag):
         if mon != -1:
-            ptr8(self._tids)[mon] = 0
-            self.num = int(self.num) - 1 <<1|1
+            self._free(mon)
         if player:
             # Explode the rocket
             player.detonate(t)
@@ -825,20 +1119,18 @@ class Monsters:
         tag = "_RIP_"
         alt = "_OUCH!_"
         # Monster specific damage behaviors
+        lnk = ptr8(self._link)
         if tid == _Pillar: # Direct hit!
-            for j in range(mon-1, -1, -1):
-                if tids[j] == _Pillar:
-                    break # Another head, we are done on this chain
-                elif tids[j] == _PillarTail: # Destroy entire chain
-                    self._kill(t, j, player, "_RIP_")
+            j = lnk[mon]-1
+            while j >= 0: # Destroy entire chain
+                k = lnk[j]-1
+                self._kill(t, j, player, "_RIP_")
+                j = k
         elif tid == _PillarTail or _DragonBones <= tid <= _Wyvern:
             tag = alt
             # Destroy last tail segment instead
-            for j in range(mon-1, -1, -1):
-                if tids[j] == _Pillar:
-                    break # Another head, we are done on this chain
-                elif tids[j] == _PillarTail:
-                    mon = j
+            while lnk[mon]:
+                mon = lnk[mon]-1
         elif tid == _LeftDoor or tid == _Lung:
             return
         elif tid == _CPU or tid == _MegaBones:
@@ -272,9 +272,10 @@ class Player:
         x = xf>>8; y = yf>>8
         yv = int(self._y_vel)
         c = int(self._c)
-        ch = self._tp.check_tape
-        cl = int(ch(x-1, y))
-        cr = int(ch(x+1, y))
+        # Solid ground around Umby (3 columns of 7 rows from x-1, y-5)
+        bx = int(self._tp.check_box(x-1, y-5, 3, 7))
+        cl = bx >> 5 & 1
+        cr = bx >> 19 & 1
         hard = self.hard
         if yf >= 16384 and not hard:
             if yf > 16384:
@@ -282,10 +283,10 @@ class Player:
                 self._y = yf <<1|1
             grounded = 1
         else:
-            grounded = (int(ch(x, y+1)) | cl | cr)
+            grounded = bx >> 13 & 1 | cl | cr
         self._air = (0 if grounded else 1) <<1|1
-        lwall = int(ch(x-1, y-3)) | cl
-        rwall = int(ch(x+1, y-3)) | cr
+        lwall = bx >> 2 & 1 | cl
+        rwall = bx >> 16 & 1 | cr
         # Apply gravity and ground check
         if not grounded:
             self._y = (yf + (yv>>(10 if self.space else 8))) <<1|1
@@ -295,7 +296,7 @@ class Player:
         if t%3: # Movement
             self._x = (xf + (-256 if c&4 and not lwall else
                 256 if c&8 and not rwall else 0)) <<1|1
-        if t%3==0 and not ch(x, y-3) and ((c&4 and lwall) or (c&8 and rwall)):
+        if t%3==0 and not bx >> 9 & 1 and ((c&4 and lwall) or (c&8 and rwall)):
             self._y = (yf-256) <<1|1 # Climbing
         # CONTROLS: Apply jump - allow continual jump until falling begins
         if y < 0:
@@ -307,15 +308,15 @@ class Player:
         elif self._topt:
             self._topt = 0 <<1|1
         if c&32 and y > -32 and (yv < 0 or grounded or self.space):
-            if grounded and not ch(x, y-4): # detatch from ground grip
+            if grounded and not bx >> 8 & 1: # detatch from ground grip
                 self._y = (yf-256) <<1|1
                 play(worm_jump, 15)
             self._y_vel = -52428 <<1|1
         # DEATH: Check for head smacking
-        if ch(x, y-4) or (y < 2 and not hard):
+        if bx >> 8 & 1 or (y < 2 and not hard):
             # Only actually die if the platform hit is largish
-            if (c&32 and hard
-            and ch(x, y-5) and ch(x, y-4) and ch(x-1, y-4) and ch(x+1, y-4)):
+            # (x, y-5 and x-1 to x+1, y-4)
+            if c&32 and hard and bx & 0x8182 == 0x8182:
                 self.die(self.name + " face-planted the roof!")
             elif yv < 0:
                 self._y_vel = 0 <<1|1
@@ -347,7 +348,7 @@ class Player:
             if ry > 69 or (self.space and ry < -5) or not (
                     -30<=rx-int(self._tp.x[0])<=102):
                 self.rocket_on = 0 <<1|1
-            if ch(rx, ry): # Explode rocket if hit the ground
+            if self._tp.check_tape(rx, ry): # Explode if hit the ground
                 self.detonate(t)
         elif b==0:
             self._hold = 0 <<1|1
@@ -425,15 +426,16 @@ class Player:
         x = int(self.x); y = int(self.y)
         xf = int(self._x); yf = int(self._y)
         dr = int(self.dir)
-        ch = self._tp.check_tape
         c = int(self._c)
         u = c&1; d = c&2; l = c&4; r = c&8; b = c&16; a = c&32
-        cd = int(ch(x, y-1))
-        crd = int(ch(x+1, y-1))
-        cld = int(ch(x-1, y-1))
-        cl = int(ch(x-1, y))
-        cr = int(ch(x+1, y))
-        cu = int(ch(x, y+3))
+        # Solid ground around Glow (5 columns of 5 rows from x-2, y-1)
+        bx = int(self._tp.check_box(x-2, y-1, 5, 5))
+        cd = bx >> 10 & 1
+        crd = bx >> 15 & 1
+        cld = bx >> 5 & 1
+        cl = bx >> 6 & 1
+        cr = bx >> 16 & 1
+        cu = bx >> 14 & 1
         falling = 0 if (cd | cld | crd | cl | cr) else 1
         self._air = falling <<1|1
         if falling and not a:
@@ -503,13 +505,13 @@ class Player:
             self._x_vel = x_vel <<1|1; self._y_vel = y_vel <<1|1
             # CONTROLS: Apply movement
             if t%2 and y < 64:
-                clu = int(ch(x-1, y+3))
-                cru = int(ch(x+1, y+3))
+                clu = bx >> 9 & 1
+                cru = bx >> 19 & 1
                 climb = (cd==0 and ((l and crd) or (r and cld)))
                 descend = cu==0 and (((cl | clu) and l) or ((cr | cru) and r))
-                lsafe = ((cld | cd | int(ch(x-2, y-1)) | int(ch(x-2, y)))
+                lsafe = ((cld | cd | bx & 1 | bx >> 1 & 1)
                     and l and (cl | clu)==0)
-                rsafe = ((crd | cd | int(ch(x+2, y-1)) | int(ch(x+2, y)))
+                rsafe = ((crd | cd | bx >> 20 & 1 | bx >> 21 & 1)
                     and r and (cr | cru)==0)
                 xf += -256 if lsafe else 256 if rsafe else 0
                 yf += 256 if descend else -256 if climb else 0
@@ -541,7 +543,7 @@ class Player:
             # Defuse if out of range
             if not (80>=ry>=-1) or not (-30<=rx-int(self._tp.x[0])<=102):
                 self.rocket_on = 0 <<1|1
-            if ch(rx, ry): # Explode rocket if hit the ground
+            if self._tp.check_tape(rx, ry): # Explode if hit the ground
                 self.detonate(t)
 
         # Aiming and launching
@@ -5,45 +5,190 @@ import gc
 from utils import *
 from machine import Pin, freq
 from array import array
+from sys import modules
+from struct import unpack
+from binascii import crc32
+from tape import Bake
 _buf = array('l', [0, 0, 0, 0, 0, 0, 0, 0])
 bA = Pin(27, Pin.IN, Pin.PULL_UP).value
 bR = Pin(5, Pin.IN, Pin.PULL_UP).value
 
 w = None # World
+_mons = None # Monsters being loaded into (for compiled monster modules)
+use_mpy = True # Import precompiled world and monster modules when built
 _loaded = None
-_last_feed = "[_","_","_","_","_]"
+# Feed pattern names (as indexed by the level records), and the patterns
+# they resolve to in the loaded world (None until resolved).
+_names = []
+_ptrns = []
+_lvls = [] # Level records of the compiled script
+_last_feed = bytearray([255, 255, 255, 255, 255]) # Name indices
+# Alternate feed lists (the tape flushes columns with the old feed)
+_feeds = ([None]*5, [None]*5)
+_bkeys = [0, 0, 0] # Bake selection keys
+
+def _index(name):
+    # Index of a feed pattern name (adding names first seen in script.txt)
+    if name not in _names:
+        _names.append(name)
+        _ptrns.append(None)
+    return _names.index(name)
+
+def _pattern(i):
+    # Feed pattern for a pattern name index, resolved once for each world
+    p = _ptrns[i]
+    if p is None:
+        n = _names[i]
+        p = _ptrns[i] = getattr(w, n[2:]) if n[:2] == "w." else globals()[n]
+    return p
+
+def _crc(path, crc=0):
+    # CRC-32 of a file (continuing from crc), to tell when something
+    # made from the file is out of date
+    buf = bytearray(256)
+    mv = memoryview(buf)
+    with open(path, "rb") as fp:
+        n = fp.readinto(buf)
+        while n:
+            crc = crc32(mv[:n], crc)
+            n = fp.readinto(buf)
+    return crc
+
+def _import(name, src):
+    # Import the precompiled module for a world or monster source file
+    # (from tools/build_mpy.py), if it is there and up to date.
+    if not use_mpy:
+        return None
+    try:
+        mod = __import__(name + "_c")
+    except ImportError:
+        return None
+    del modules[name + "_c"] # Only kept while the world is loaded
+    return mod if mod._SRC_CRC == _crc(src) else None
+
 def _load_world(tape, mons, world, feed):
-    global _loaded, _last_feed
+    # Load the world (if not loaded) and set the tape feed from
+    # the pattern name indices.
+    global _loaded
     if _loaded != world:
-        global w
+        global w, _mons
         tape.feed = None
-        mons.ticks = None
+        mons.set_ticks(None)
         w = None
+        for i in range(len(_ptrns)):
+            _ptrns[i] = None
+        if tape.bake:
+            tape.bake.close()
+            tape.bake = None
         gc.collect()
-        with open(f"/Games/Umby&Glow/world{world}.py") as fp:
-            exec(fp.read())
+        src = f"/Games/Umby&Glow/world{world}.py"
+        mod = _import(f"world{world}", src)
+        if mod:
+            w = mod.w
+        else:
+            with open(src) as fp:
+                exec(fp.read())
+        mod = None
+        # Stream pre-generated columns if the world has been baked
+        # (from the same world and utils.py patterns)
+        try:
+            tape.bake = Bake(f"/Games/Umby&Glow/world{world}.bake",
+                _crc("/Games/Umby&Glow/utils.py", _crc(src)), _index)
+        except (OSError, ValueError):
+            pass
         try:
             gc.collect()
-            with open(f"/Games/Umby&Glow/mons{world}.py") as fp:
-                exec(fp.read())
+            _mons = mons
+            src = f"/Games/Umby&Glow/mons{world}.py"
+            if not _import(f"mons{world}", src):
+                with open(src) as fp:
+                    exec(fp.read())
         except OSError:
             pass
+        _mons = None
+        # Resolve the patterns of the world's levels up front,
+        # so changing level within the world doesn't allocate.
+        for lvl in _lvls:
+            if lvl[0] == world:
+                for i in lvl[1]:
+                    _pattern(i)
         gc.collect()
         _loaded = world
-    tape.feed = eval(feed)
-    split = feed.split(',')
-    # Reset any offscreen background changes
-    if split[0] != _last_feed[0]:
+    nf = _feeds[1] if tape.feed is _feeds[0] else _feeds[0]
+    for i in range(5):
+        nf[i] = _pattern(feed[i])
+    tape.feed = nf
+    if tape.bake:
+        _bkeys[0] = feed[0]
+        _bkeys[1] = 1 << 16 | feed[1] | feed[2] << 8
+        _bkeys[2] = 2 << 16 | feed[3] | feed[4] << 8
+        tape.bake.select(_bkeys)
+    # Reset any offscreen background changes (as they are needed)
+    if feed[0] != _last_feed[0]:
         start = tape.bx[0]
-        for i in range(start+72, start+144):
-            tape.redraw_tape(0, i, tape.feed[0], None)
-    if split[1] != _last_feed[1] or split[2] != _last_feed[2]:
+        tape.stale_tape(0, start+72, start+144)
+    if feed[1] != _last_feed[1] or feed[2] != _last_feed[2]:
         start = tape.midx[0]
-        for i in range(start+72, start+144):
-            tape.redraw_tape(1, i, tape.feed[1], tape.feed[2])
-    _last_feed = split
+        tape.stale_tape(1, start+72, start+144)
+    for i in range(5):
+        _last_feed[i] = feed[i]
+
+def _open_bin():
+    # Open the compiled script (from tools/compile_script.py) if it is
+    # there and up to date, returning (file, events, chapters), and
+    # reading in the pattern names and level records.
+    try:
+        fp = open("/Games/Umby&Glow/script.bin", "rb")
+    except OSError:
+        return None, 0, 0
+    magic, crc, nev, nch, nnm, nlv = unpack("<4sIHHHH", fp.read(16))
+    if magic != b"UGS2" or crc != _crc("/Games/Umby&Glow/script.txt"):
+        fp.close()
+        return None, 0, 0
+    tbl = 16 + nev*16 + nch*8
+    for i in range(nnm):
+        fp.seek(tbl + i*4)
+        fp.seek(unpack("<I", fp.read(4))[0])
+        _names.append(fp.read(unpack("<H", fp.read(2))[0]).decode())
+        _ptrns.append(None)
+    tbl += nnm*4
+    for i in range(nlv):
+        # (world, feed name indices, spawner, flags, monster pool size)
+        fp.seek(tbl + i*4)
+        fp.seek(unpack("<I", fp.read(4))[0])
+        r = fp.read(9)
+        n = r[8]
+        _lvls.append((str(r[0]), r[1:6],
+            (bytearray(fp.read(n)), bytearray(fp.read(n))),
+            r[6], r[7]))
+    return fp, nev, nch
+_bin, _nev, _nch = _open_bin()
+
+def _row(k):
+    # Event table entry
+    # (position, furthest position, text offset, level+1, record+1)
+    _bin.seek(16 + k*16)
+    return unpack("<iiIHH", _bin.read(16))
+
+def _text(off):
+    _bin.seek(off)
+    return _bin.read(unpack("<H", _bin.read(2))[0]).decode()
+
+def _event(row):
+    # Event text, or the level record index for a level event
+    return row[4]-1 if row[4] else _text(row[2])
 
-def _script():
+def _script(k=0):
+    global _k
+    if _bin: # Read on from event k of the compiled script
+        prev = _row(k-1)[0] if k else 0
+        while k < _nev:
+            row = _row(k)
+            _k = k
+            yield row[0]-prev, _event(row)
+            prev = row[0]
+            k += 1
+        return
     with open("/Games/Umby&Glow/script.txt") as fp:
         for line in fp:
             if line and line[0] != "#" and line[0] != "\n":
@@ -51,27 +196,61 @@ def _script():
                 yield int(dist), ev_str.strip()
 
 def get_chapters():
+    if _bin: # Straight from the chapter table
+        for c in range(_nch):
+            _bin.seek(16 + _nev*16 + c*8)
+            pos, off = unpack("<iI", _bin.read(8))
+            yield (_text(off), pos)
+        return
     pos = -145
     for dist, ev in _script():
         pos += dist
         if ev.startswith('"CHAPTER~') or ev.startswith('"~'):
             yield (eval(ev), pos)
 
+_k = 0 # Index of the next event (for the compiled script)
 _line = _script()
 _next_at, _next_event = next(_line)
 state = [_next_at] # Last event for save state
 
 def _load_lvl(tape, mons, ev):
-    _load_world(tape, mons, ev[0], ev[1])
+    # Load a level record (world, feed pattern name indices, spawner,
+    # flags, monster pool size) or level event from script.txt
+    feed = ev[1]
+    if isinstance(feed, str):
+        feed = bytes(_index(n.strip("[] ")) for n in feed.split(','))
+    _load_world(tape, mons, ev[0], feed)
     tape.spawner = ev[2]
     for plyr in tape.players:
         plyr.space = ev[3] & 1
     tape.cam_shake = ev[3] >> 1
+    # Optional monster pool size for the level
+    mons.size = min(ev[4] if len(ev) > 4 else 48, mons.most)
 
 def story_jump(tape, mons, start, lobby):
-    global _next_event, _next_at
+    global _next_event, _next_at, _line, _k
+    if _next_at <= start and _bin:
+        # Binary search for the first event after the starting position
+        # (by the furthest position so far, as events can step back).
+        lo = _k+1
+        hi = _nev-1
+        while lo < hi:
+            mid = (lo+hi)//2
+            if _row(mid)[1] > start:
+                hi = mid
+            else:
+                lo = mid+1
+        lvl = _row(lo)[3]-1 # Last level event (if passed on the way)
+        state[0] = _row(lo-1)[0]
+        row = _row(lo)
+        _next_at = row[0]
+        _next_event = _event(row)
+        _line = _script(lo+1)
+        if lvl > _k:
+            _load_lvl(tape, mons, _lvls[_row(lvl)[4]-1])
+        _k = lo
     # Scan script finding the starting position
-    if _next_at <= start:
+    elif _next_at <= start:
         lvl = None
         for dist, _next_event in _line:
             state[0] = _next_at
@@ -165,7 +344,9 @@ def story_events(tape, mons, coop_px, autotxt, outbuf, inbuf):
     pos = posx if posx > coop_px else coop_px # Furthest of both players
     if pos >= _next_at:
         state[0] = _next_at
-        event = eval(_next_event)
+        # Level events are record indices in the compiled script
+        event = (_lvls[_next_event] if isinstance(_next_event, int)
+            else eval(_next_event))
         if isinstance(event, tuple):
             _load_lvl(tape, mons, event)
         elif isinstance(event, str):
@@ -1,6 +1,7 @@
 from array import array
-from utils import ihash
-from display import display_buffer
+from struct import unpack_from
+from utils import ihash, pattern_none, pattern_fill
+from display import display
 
 # Font by Auri (@Auri#8401)
 _font = (
@@ -14,22 +15,154 @@ _font = (
     )
 _font_index = " ABCDEFGHIJKLMNOPQRSTUVWXYZ"+"0123456789"+"!?:;'\"/><[]().,+*-"
 
-def _gen_bang(blast_x, blast_y, blast_size, invert):
+# Blast hole stencils for each column from the centre (-10 to 9):
+# [carve (radius 8), fill carve (radius 10)] with the centre row at bit 16.
+_bang = array('l', (sum(1 << dy+16 for dy in range(-16, 16)
+    if (i//2-10)**2 + dy*dy < (10 if i%2 else 8)**2) for i in range(40)))
+# Number of blasts that can be queued before they are carved out
+_BLASTS = const(8)
+
+# Columns per block of a baked tape file
+_BLOCK = const(64)
+
+class Bake:
+    # Streams pre-generated tape columns from a baked world file
+    # (made with tools/bake_tape.py).
+    # File layout (little endian):
+    #   header: "UGB1", CRC-32 of the world source then utils.py (u32),
+    #       section count (u16)
+    #   sections: layer (u8), key length (u8), key, x0 (i32), x1 (i32),
+    #       offset of block index (u32)
+    #   block index (per section): offset of each block, then the end (u32)
+    #   blocks (_BLOCK columns): per column, a byte flagging which of the
+    #       4 words [pattern top, pattern bottom, fill top, fill bottom]
+    #       differ from the previous column, followed by those words (i32).
+    def __init__(self, path, crc, index):
+        # Sections are keyed by layer<<16 | first name | second name<<8
+        # (as feed pattern name indices from index).
+        f = self._f = open(path, "rb")
+        head = f.read(10)
+        if head[:4] != b"UGB1" or unpack_from("<I", head, 4)[0] != crc:
+            f.close()
+            raise ValueError("stale bake")
+        self._sections = {}
+        for _ in range(unpack_from("<H", head, 8)[0]):
+            layer, n = f.read(2)
+            key = layer << 16
+            for j, name in enumerate(f.read(n).decode().split(",")):
+                key |= index(name) << j*8
+            x0, x1, idx = unpack_from("<iiI", f.read(12))
+            self._sections.setdefault(key, []).append((x0, x1, idx))
+        self._sel = [(), (), ()]
+        self._raw = bytearray(_BLOCK*17)
+        self._ofs = bytearray(8)
+        # Decoded block of columns for each layer (4 words per column)
+        self.cols = array('l', (0 for i in range(3*_BLOCK*4)))
+        # Loaded range for each layer: [x start, x end, cols offset (or -1)]
+        self.span = array('l', [0, 0, -1, 0, 0, -1, 0, 0, -1])
+
+    def close(self):
+        self._f.close()
+
+    def select(self, keys):
+        # Use the baked sections for the feed keys of each layer
+        # ([back, mid, fore], or None to stop using the bake).
+        get = self._sections.get
+        for layer in range(3):
+            self._sel[layer] = get(keys[layer], ()) if keys else ()
+            self.span[layer*3+1] = self.span[layer*3]
+
+    def load(self, layer, x):
+        # Load the block containing column x of the layer,
+        # or the unbaked range around it.
+        span = self.span
+        s = layer*3
+        lo, hi = -1073741824, 1073741823
+        for x0, x1, idx in self._sel[layer]:
+            if x0 <= x < x1:
+                blk = (x-x0)//_BLOCK
+                bx = x0 + blk*_BLOCK
+                n = x1-bx if x1-bx < _BLOCK else _BLOCK
+                f = self._f
+                f.seek(idx + blk*4)
+                f.readinto(self._ofs)
+                a, b = unpack_from("<II", self._ofs)
+                f.seek(a)
+                f.readinto(memoryview(self._raw)[:b-a])
+                self._decode(self._raw, n, layer*_BLOCK*4)
+                span[s] = bx
+                span[s+1] = bx+n
+                span[s+2] = layer*_BLOCK*4
+                return
+            if x0 > x and x0 < hi:
+                hi = x0
+            elif x1 <= x and x1 > lo:
+                lo = x1
+        span[s] = lo
+        span[s+1] = hi
+        span[s+2] = -1
+
     @micropython.viper
-    def p(x: int, oY: int) -> int:
-        s = int(blast_size)
-        f = int(invert)
-        _by = int(blast_y)
-        tx = x-int(blast_x)
-        v = 0
-        for y in range(oY, oY+32):
-            ty = y-_by
-            a = 0 if tx*tx+ty*ty < s*s else 1
-            v |= (
-                a if f == 0 else (0 if a else 1)
-            ) << (y-oY)
-        return v
-    return p
+    def _decode(self, raw: ptr8, n: int, o: int):
+        cols = ptr32(self.cols)
+        p = 0
+        for i in range(n):
+            m = raw[p]
+            p += 1
+            for k in range(4):
+                if m >> k & 1:
+                    cols[o] = (raw[p] | raw[p+1] << 8
+                        | raw[p+2] << 16 | raw[p+3] << 24)
+                    p += 4
+                else:
+                    cols[o] = cols[o-4] if i else 0
+                o += 1
+
+# Number of recently generated columns remembered for each tape layer
+# (must be a power of 2).
+_CACHE = const(32)
+
+# Size of the monster spawn schedule, and how far ahead it is rolled
+# (spawners must have at most _SPAWNS monster types).
+_SPAWNS = const(64)
+_SPAWN_AHEAD = const(256)
+
+# Approximate size (in bytes) the text cache can grow to
+_TEXT_CACHE = const(1024)
+
+class _TextCache:
+    # Least recently used cache of laid out and rendered text,
+    # forgetting the oldest once there are over _TEXT_CACHE bytes.
+    # Entries are [size, value, last used stamp], so a hit only
+    # updates the stamp (the oldest is only searched for when full).
+    def __init__(self):
+        self._vals = {}
+        self._size = 0
+        self._stamp = 0
+
+    def get(self, key):
+        v = self._vals.get(key)
+        if v is None:
+            return None
+        self._stamp += 1
+        v[2] = self._stamp
+        return v[1]
+
+    def put(self, key, val, size):
+        vals = self._vals
+        size += 32 # Allow for the entry overhead
+        self._size += size
+        while vals and self._size > _TEXT_CACHE:
+            old = None
+            for k in vals:
+                if old is None or vals[k][2] < vals[old][2]:
+                    old = k
+            self._size -= vals.pop(old)[0]
+        self._stamp += 1
+        vals[key] = [size, val, self._stamp]
+
+# Number of stale offscreen tape columns to generate each tick
+_REFILL = const(4)
 
 class Tape:
     def __init__(self):
@@ -42,10 +175,51 @@ class Tape:
         # Custom emojis: @ = Umby and ^ = Glow
         self._abc = _font + bytearray([128,240,48,0,248,192])
         self._abc_i = dict((v, i) for i, v in enumerate(_font_index+"@^"))
+        # Font columns of recent lines of text, and recent message layouts
+        self._text = _TextCache()
+        # Recently generated columns for each layer (ring of _CACHE entries):
+        # [x, pattern top, pattern bottom, fill top, fill bottom]
+        self._cache = array('l', (0 for i in range(3*_CACHE*5)))
+        # Column cache [hits, misses] (for profiling)
+        self.cache_stats = array('l', [0, 0])
+        # Columns of each layer still to be generated from the feed (after a
+        # reset), and the count of them for each layer.
+        self._stale = bytearray(3*216)
+        self._nstale = array('l', [0, 0, 0])
+        # Columns of each layer that are not empty (or not known to be),
+        # the count of them for each layer, and whether the feed for each
+        # layer makes empty columns. Empty layers are left out by comp.
+        # Empty is no pattern for the back and middle layers (regardless
+        # of the middle fill), and no pattern and a solid fill for the
+        # foreground.
+        self._varies = bytearray([1]*(3*216))
+        self._nvaries = array('l', [216, 216, 216])
+        self._empty_feed = bytearray(3)
+        # Baked columns to use for the feed (Bake), instead of the patterns
+        self.bake = None
         # The patterns to feed into each tape section
+        self._feed = None
         self.feed = [None, None, None, None, None]
         self.cam_shake = 0
         self._stage = array('l', (0 for i in range(72*2*3+132*2)))
+        # Screen columns needing to be composited again for each frame
+        # parity (bits 1 and 2), and columns drawn on the stage this frame
+        # (bit 4) which need compositing again after the stage is cleared.
+        self._dirty = bytearray([3]*72)
+        # Composited words for each screen column, for each frame parity
+        # (for the dimming dither): [a, b, a gray, b gray]
+        self._comp = array('l', (0 for i in range(72*2*4)))
+        # Scroll positions the composited words were made for
+        # [backPos, midPos, forePos, yPos]
+        self._comp_pos = array('l', [0, 0, 0, -1])
+        # Queued blasts [count, x, y, x, y, ...]
+        self._blasts = array('l', (0 for i in range(1+_BLASTS*2)))
+        # Rolled monster spawns for the upcoming tape: [count, next spawn,
+        # camera position from, camera position up to], and for each spawn
+        # the camera position, and the [type, y position].
+        self._sched = array('l', [0, 0, 0, 0])
+        self._sched_x = array('l', (0 for i in range(_SPAWNS)))
+        self._sched_m = bytearray(_SPAWNS*2)
         self.spawner = (bytearray([]), bytearray([]))
         def _pass(*arg):
             pass
@@ -58,6 +232,33 @@ class Tape:
         self.clear_overlay()
         self.clear_stage()
 
+    @property
+    def feed(self):
+        return self._feed
+
+    @feed.setter
+    def feed(self, feed):
+        # Stale columns were meant for the old patterns, so make them now
+        if self._feed:
+            self._flush()
+        # New patterns make all the cached columns stale
+        self._feed = feed
+        e = self._empty_feed
+        e[0] = 1 if feed and feed[0] is pattern_none else 0
+        e[1] = 1 if feed and feed[1] is pattern_none else 0
+        e[2] = 1 if (feed and feed[3] is pattern_none
+            and feed[4] is pattern_fill) else 0
+        self._uncache()
+        if self.bake:
+            self.bake.select(None)
+
+    @micropython.viper
+    def _uncache(self):
+        cache = ptr32(self._cache)
+        stale = 1 << 31
+        for i in range(0, 3*_CACHE*5, 5):
+            cache[i] = stale
+
     @micropython.viper
     def reset(self, p: int):
         self.mons_clear()
@@ -66,13 +267,94 @@ class Tape:
         scroll[0] = p//4
         scroll[1] = p//2
         scroll[3] = p
-        # Reset the tape buffers for all layers and fill with the current feed.
+        self._redirty()
+        # Mark the tape buffers for all layers stale, so they fill with the
+        # current feed as they are needed.
+        st = ptr8(self._stale)
+        for i in range(3*216):
+            st[i] = 1
+        nst = ptr32(self._nstale)
+        nst[0] = 216
+        nst[1] = 216
+        nst[2] = 216
+        # Drop blasts queued for the old tape
+        ptr32(self._blasts)[0] = 0
+
+    @micropython.viper
+    def stale_tape(self, layer: int, start: int, end: int):
+        # Generate columns again from the current feed when they are needed
+        st = ptr8(self._stale)
+        nst = ptr32(self._nstale)
+        for x in range(start, end):
+            s = layer*216 + x%216
+            if not st[s]:
+                st[s] = 1
+                nst[layer] += 1
+
+    @micropython.viper
+    def _refill(self, layer: int, x: int):
+        # Generate the column at x now if it is stale
+        if ptr8(self._stale)[layer*216 + x%216]:
+            l = 3 if layer == 2 else layer
+            p = ptr32(self._tape_scroll)[l] - 72
+            x = p + (x-p)%216 # Column held in this part of the tape
+            self._feed_tape(layer, x)
+            self._touch(l, x)
+
+    @micropython.viper
+    def _flush(self):
+        # Generate all the stale columns
+        st = ptr8(self._stale)
+        nst = ptr32(self._nstale)
         scroll = ptr32(self._tape_scroll)
         for i in range(3):
-            layer = 3 if i == 2 else i
-            tapePos = scroll[layer]
-            for x in range(tapePos-72, tapePos+144):
-                self.redraw_tape(i, x, self.feed[layer], self.feed[layer+1])
+            if not nst[i]:
+                continue
+            p = scroll[3 if i == 2 else i]
+            for x in range(p-72, p+144):
+                if st[i*216 + x%216]:
+                    self._feed_tape(i, x)
+        self._redirty()
+
+    @micropython.viper
+    def _prefetch(self):
+        # Generate the stale columns on screen, and a few of the offscreen
+        # ones each tick (nearest first).
+        st = ptr8(self._stale)
+        nst = ptr32(self._nstale)
+        scroll = ptr32(self._tape_scroll)
+        dirty = ptr8(self._dirty)
+        budget = _REFILL
+        for i in range(3):
+            if not nst[i]:
+                continue
+            p = scroll[3 if i == 2 else i]
+            o = i*216
+            for x in range(p, p+72):
+                if st[o + x%216]:
+                    self._feed_tape(i, x)
+                    dirty[x-p] |= 3
+            for d in range(72):
+                if budget <= 0 or not nst[i]:
+                    break
+                x = p+72+d
+                if st[o + x%216]:
+                    self._feed_tape(i, x)
+                    budget -= 1
+                x = p-1-d
+                if st[o + x%216]:
+                    self._feed_tape(i, x)
+                    budget -= 1
+
+    @micropython.viper
+    def tick(self):
+        # Keep the tape up to date each game tick, whether or not the
+        # frame is composited: generate stale columns, and carve blasts.
+        nst = ptr32(self._nstale)
+        if nst[0] or nst[1] or nst[2]:
+            self._prefetch()
+        if ptr32(self._blasts)[0]:
+            self.carve_blasts()
 
     @micropython.viper
     def check(self, x: int, y: int, b: int) -> bool:
@@ -92,7 +374,10 @@ class Tape:
         r1 = -30 if layer == 1 else 0
         r2 = 101 if layer == 1 else 71
         draw = ptr32(self._stage)
+        dirty = ptr8(self._dirty)
         for i in range(x if x >= r1 else r1, x+w if x+w <= r2 else r2):
+            if 0 <= i < 72:
+                dirty[i] |= 7
             b = uint(img[i-o])
             draw[p+i*2] |= (b << y) if y >= 0 else (b >> 0-y)
             draw[p+i*2+1] |= (b << y-32) if y >= 32 else (b >> 32-y)
@@ -102,7 +387,9 @@ class Tape:
         o = x-f*w
         p = layer*144
         draw = ptr32(self._stage)
+        dirty = ptr8(self._dirty)
         for i in range(x if x >= 0 else 0, x+w if x+w < 72 else 71):
+            dirty[i] |= 7
             b = uint(img[i-o])
             draw[p+i*2] &= -1 ^ ((b<<y) if y >= 0 else (b>>0-y))
             draw[p+i*2+1] &= -1 ^ ((b<<y-32) if y >= 32 else (b>>32-y))
@@ -112,51 +399,106 @@ class Tape:
         tape = ptr32(self._tape)
         scroll = ptr32(self._tape_scroll)
         stg = ptr32(self._stage)
-        frame = ptr8(display_buffer)
+        frame = ptr8(display.buffer)
+        dirty = ptr8(self._dirty)
+        cw = ptr32(self._comp)
         scroll[2] += 1 # Counter (increment)
         y_pos = scroll[4]
+        # Composite all columns again if the view has moved
+        cpos = ptr32(self._comp_pos)
+        if (cpos[0] != scroll[0] or cpos[1] != scroll[1]
+                or cpos[2] != scroll[3] or cpos[3] != y_pos):
+            cpos[0] = scroll[0]
+            cpos[1] = scroll[1]
+            cpos[2] = scroll[3]
+            cpos[3] = y_pos
+            for x in range(72):
+                dirty[x] |= 3
+            moved = 1
+        else:
+            moved = 0
+        # Mark the display words of the columns that changed from the
+        # last frame (composited for the other parity).
+        dd = ptr32(display.dirty)
+        for i in range(int(len(display.dirty))):
+            dd[i] = 0
+        fb = 1 << (scroll[2] & 1) # Dirty bit for this frame parity
+        # Layers with any columns that are not empty
+        nv = ptr32(self._nvaries)
+        vback = nv[0]
+        vmid = nv[1]
+        vfore = nv[2]
         # Loop through each column of pixels
         for x in range(72):
-            # Compose the first 32 bits vertically.
-            p0 = (x+scroll[0])%216*2
-            p1 = (x+scroll[1])%216*2
-            p3 = (x+scroll[3])%216*2
-            dim = int(1431655765) << ((scroll[2]+x+y_pos+p1)%2)
-            x2 = x*2
-            # Composite onto layers
-            overlay_mask = tape[x2+2160] << y_pos
-            overlay_draw = tape[x2+2304] << y_pos
-            for i in range(2):
-                actrs = stg[x2+492]
-                tlnd = tape[p3+1296]
-                ntlnd = -1^tlnd
-                glare = stg[x2]
-                tlndfll = tape[p3+1728]
-                tlndshd = tlnd & (-1^(ntlnd ^ (
-                    -1^(tlnd<<5 | int(uint(tape[p3+1297])>>27) if i else tlnd>>5))
-                    ) | dim | -1^glare) | -1^tlndfll
-                back = ((# Back/mid layer (etching glare and fill)
-                            ((tape[p0] & dim | tape[p1+432]) & glare
-                                & tape[p1+864] & tlndfll)
-                            # Background (non-interactive) monsters
-                            | stg[x2+288]
-                        )  & ntlnd & overlay_mask
-                    | tlndshd
-                    # Aliased land
-                    | ((tlnd<<1 | tlnd>>1) & ntlnd)
-                    | actrs)
-                # Convert to grayscale layers
-                b = uint(((tlnd & tlndfll & stg[x2+144] | actrs) & overlay_mask) | overlay_draw)
-                bg = uint(back ^ (back & (actrs & overlay_mask | overlay_draw)))
-                if i == 0:
-                    a, ag = b, bg
-                    # The second pass should compose the second 32 bits vertically.
-                    overlay_mask = int(uint(tape[x2+2160]) >> 32-y_pos) | (tape[x2+2161] << y_pos)
-                    overlay_draw = int(uint(tape[x2+2304]) >> 32-y_pos) | (tape[x2+2305] << y_pos)
-                    p0 += 1
-                    p1 += 1
-                    p3 += 1
-                    x2 += 1
+            c = (x*2 + (scroll[2] & 1))*4
+            if not dirty[x] & fb:
+                # Unchanged column, use the last composite for this parity
+                a = uint(cw[c])
+                b = uint(cw[c+1])
+                ag = uint(cw[c+2])
+                bg = uint(cw[c+3])
+            else:
+                dirty[x] ^= fb
+                p0 = (x+scroll[0])%216*2
+                p1 = (x+scroll[1])%216*2
+                p3 = (x+scroll[3])%216*2
+                dim = int(1431655765) << ((scroll[2]+x+y_pos+p1)%2)
+                x2 = x*2
+                # Composite onto layers
+                overlay_mask = tape[x2+2160] << y_pos
+                overlay_draw = tape[x2+2304] << y_pos
+                for i in range(2):
+                    actrs = stg[x2+492]
+                    glare = stg[x2]
+                    # Back/mid layer (etching glare and fill), leaving out
+                    # the layers which are empty.
+                    if vback:
+                        bgl = ((tape[p0] & dim | tape[p1+432]) & glare
+                            & tape[p1+864])
+                    elif vmid:
+                        bgl = tape[p1+432] & glare & tape[p1+864]
+                    else:
+                        bgl = 0
+                    if vfore:
+                        tlnd = tape[p3+1296]
+                        ntlnd = -1^tlnd
+                        tlndfll = tape[p3+1728]
+                        tlndshd = tlnd & (-1^(ntlnd ^ (
+                            -1^(tlnd<<5 | int(uint(tape[p3+1297])>>27) if i else tlnd>>5))
+                            ) | dim | -1^glare) | -1^tlndfll
+                        back = ((bgl & tlndfll
+                                    # Background (non-interactive) monsters
+                                    | stg[x2+288]
+                                )  & ntlnd & overlay_mask
+                            | tlndshd
+                            # Aliased land
+                            | ((tlnd<<1 | tlnd>>1) & ntlnd)
+                            | actrs)
+                        # Convert to grayscale layers
+                        b = uint(((tlnd & tlndfll & stg[x2+144] | actrs) & overlay_mask) | overlay_draw)
+                    else:
+                        # No foreground (empty with solid fill)
+                        back = (bgl | stg[x2+288]) & overlay_mask | actrs
+                        b = uint(actrs & overlay_mask | overlay_draw)
+                    bg = uint(back ^ (back & (actrs & overlay_mask | overlay_draw)))
+                    if i == 0:
+                        a, ag = b, bg
+                        # The second pass should compose the second 32 bits vertically.
+                        overlay_mask = int(uint(tape[x2+2160]) >> 32-y_pos) | (tape[x2+2161] << y_pos)
+                        overlay_draw = int(uint(tape[x2+2304]) >> 32-y_pos) | (tape[x2+2305] << y_pos)
+                        p0 += 1
+                        p1 += 1
+                        p3 += 1
+                        x2 += 1
+                cw[c] = int(a)
+                cw[c+1] = int(b)
+                cw[c+2] = int(ag)
+                cw[c+3] = int(bg)
+            o = c^4 # Other parity
+            if (moved or cw[o] != int(a) or cw[o+1] != int(b)
+                    or cw[o+2] != int(ag) or cw[o+3] != int(bg)):
+                for r in range(x, 360, 72):
+                    dd[r>>7] |= 1 << (r>>2 & 31)
             # Apply the relevant pixels to next vertical column of the display
             # buffer, while also accounting for the vertical offset.
             ry = 32 - y_pos
@@ -179,18 +521,126 @@ class Tape:
             stg[i] = 0
         for i in range(288):
             stg[i] = -1
+        # Columns drawn to last frame need compositing again
+        dirty = ptr8(self._dirty)
+        for i in range(72):
+            if dirty[i] & 4:
+                dirty[i] = 3
+
+    @micropython.viper
+    def _redirty(self):
+        dirty = ptr8(self._dirty)
+        for i in range(72):
+            dirty[i] |= 3
+
+    @micropython.viper
+    def _touch(self, l: int, x: int):
+        # Composite a changed tape column again if it is on screen
+        i = x - ptr32(self._tape_scroll)[l]
+        if 0 <= i < 72:
+            ptr8(self._dirty)[i] |= 3
+
+    @micropython.viper
+    def _vary(self, layer: int, x: int):
+        # Mark a column drawn to, as it may not be empty
+        s = layer*216 + x%216
+        v = ptr8(self._varies)
+        if not v[s]:
+            v[s] = 1
+            ptr32(self._nvaries)[layer] += 1
 
     @micropython.viper
     def check_tape(self, x: int, y: int) -> bool:
+        if ptr32(self._blasts)[0]:
+            self.carve_blasts()
+        if ptr32(self._nstale)[2]:
+            self._refill(2, x)
         tape = ptr32(self._tape)
         p = x%216*2+1296
         return bool(tape[p] & (1 << y) if y < 32 else tape[p+1] & (1 << y-32))
     
     @micropython.viper
-    def scroll_tape(self, back_move: int, mid_move: int, fore_move: int):
+    def check_box(self, x: int, y: int, w: int, h: int) -> int:
+        # Solid foreground in the w by h area from x, y (top left) as bits,
+        # h bits for each column from the top (w*h must be at most 30).
+        if ptr32(self._blasts)[0]:
+            self.carve_blasts()
+        tape = ptr32(self._tape)
+        stale = ptr32(self._nstale)[2]
+        m = (1 << h) - 1
+        v = 0
+        for i in range(w):
+            if stale:
+                self._refill(2, x+i)
+            p = (x+i)%216*2+1296
+            a = uint(tape[p])
+            b = uint(tape[p+1])
+            # Rows y to y+h of the column (rows off the tape are empty)
+            c = (uint(0) if y >= 64 or y+h <= 0 else b >> y-32 if y >= 32
+                else a >> y | b << 32-y if y > 0 else a << 0-y)
+            v |= int(c & m) << i*h
+        return v
+
+    @micropython.viper
+    def _feed_tape(self, layer: int, x: int):
+        # Fill a column of a layer from the feed, reusing the column if
+        # it was recently generated (such as when the camera moves back).
         tape = ptr32(self._tape)
+        cache = ptr32(self._cache)
+        l = 3 if layer == 2 else layer
+        offX = l*432 + x%216*2
+        st = ptr8(self._stale)
+        s = layer*216 + x%216
+        if st[s]:
+            st[s] = 0
+            ptr32(self._nstale)[layer] -= 1
+        # Track whether the column is empty (for comp)
+        v = ptr8(self._varies)
+        e = ptr8(self._empty_feed)[layer]
+        if v[s] == e:
+            v[s] = 1-e
+            ptr32(self._nvaries)[layer] += 1-e-e
+        c = (layer*_CACHE + (x&(_CACHE-1)))*5
+        gen = 0
+        if cache[c] == x:
+            ptr32(self.cache_stats)[0] += 1
+        else:
+            ptr32(self.cache_stats)[1] += 1
+            cache[c] = x
+            gen = 1
+            bake = self.bake
+            if bake:
+                # Copy the column from the baked tape if it is available
+                span = ptr32(bake.span)
+                s = layer*3
+                if not span[s] <= x < span[s+1]:
+                    bake.load(layer, x)
+                if span[s+2] >= 0:
+                    cols = ptr32(bake.cols)
+                    i = span[s+2] + (x-span[s])*4
+                    cache[c+1] = cols[i]
+                    cache[c+2] = cols[i+1]
+                    cache[c+3] = cols[i+2]
+                    cache[c+4] = cols[i+3]
+                    gen = 0
+        if gen:
+            feed = self._feed
+            pattern = feed[l]
+            cache[c+1] = int(pattern(x, 0))
+            cache[c+2] = int(pattern(x, 32))
+            if l != 0:
+                fill_pattern = feed[l+1]
+                cache[c+3] = int(fill_pattern(x, 0))
+                cache[c+4] = int(fill_pattern(x, 32))
+        tape[offX] = cache[c+1]
+        tape[offX+1] = cache[c+2]
+        if l != 0:
+            tape[offX+432] = cache[c+3]
+            tape[offX+433] = cache[c+4]
+
+    @micropython.viper
+    def scroll_tape(self, back_move: int, mid_move: int, fore_move: int):
         scroll = ptr32(self._tape_scroll)
-        feed = self.feed
         for i in range(3):
             layer = 3 if i == 2 else i
             move = fore_move if i == 2 else mid_move if i == 1 else back_move
@@ -201,37 +651,129 @@ class Tape:
             scroll[layer] = tapePos
             # Find the tape position for the column that needs to be filled
             x = tapePos + 143 if move == 1 else tapePos - 72
-            offX = layer*432 + x%216*2
             # Update 2 words of vertical pattern for the tape
             # (the top 32 bits, then the bottom 32 bits)
-            pattern = feed[layer]
-            tape[offX] = int(pattern(x, 0))
-            tape[offX+1] = int(pattern(x, 32))
-            if layer != 0:
-                fill_pattern = feed[layer + 1]
-                tape[offX+432] = int(fill_pattern(x, 0))
-                tape[offX+433] = int(fill_pattern(x, 32))
-        # Spawn new monsters
+            self._feed_tape(i, x)
+        self._spawn(scroll[3]-1, scroll[3])
+
+    @micropython.viper
+    def scroll_by(self, n: int):
+        # Scroll the camera n columns (forwards or backwards) in one go,
+        # moving the background layers as far as they would have moved one
+        # column at a time. The new columns fill in as they are needed.
+        if n == 0:
+            return
+        scroll = ptr32(self._tape_scroll)
+        c = scroll[3]
+        # Camera positions scrolled from (the back moves on multiples of 4
+        # and the middle on odd positions).
+        lo = c if n > 0 else c+n+1
+        hi = c+n if n > 0 else c+1
+        for i in range(3):
+            layer = 3 if i == 2 else i
+            move = (n if i == 2 else hi//2 - lo//2 if i == 1
+                else (hi+3)//4 - (lo+3)//4)
+            if not move:
+                continue
+            if n < 0 and i != 2:
+                move = 0-move
+            tapePos = scroll[layer]
+            scroll[layer] = tapePos + move
+            # Columns now in the buffer (or the whole buffer)
+            if move > 0:
+                start = tapePos+144 if move < 216 else tapePos+move-72
+            else:
+                start = tapePos+move-72
+            self.stale_tape(i, start, start + (move if 0 < move < 216
+                else 0-move if -216 < move < 0 else 216))
+        # Spawn monsters over the scrolled tape that is still nearby
+        self._spawn(c if 0 < n < 216 else c+n-216 if n > 0 else c+n-1, c+n)
+
+    @property
+    def spawner(self):
+        return self._spawner
+
+    @spawner.setter
+    def spawner(self, spawner):
+        # New spawn rates apply from the next unseen tape, so the
+        # schedule is rolled again.
+        self._spawner = spawner
+        self._sched[3] = self._sched[2]
+
+    @micropython.viper
+    def _schedule(self, start: int):
+        # Roll the monster spawns from camera position start onwards,
+        # for _SPAWN_AHEAD positions or until the schedule is full.
+        sm = ptr32(self._sched)
+        sx = ptr32(self._sched_x)
+        st = ptr8(self._sched_m)
+        spawner = self._spawner
+        types = ptr8(spawner[0])
+        rates = ptr8(spawner[1])
+        nt = int(len(spawner[0]))
+        n = 0
+        p = start
+        end = start + _SPAWN_AHEAD
+        if not nt:
+            p = end
+        while p < end and n + nt <= _SPAWNS:
+            r = int(uint(ihash(p))>>3)
+            # Randomly spawn each monster type at its configured rate
+            for i in range(nt):
+                if r%2057 < rates[i]:
+                    sx[n] = p
+                    st[n*2] = types[i]
+                    st[n*2+1] = r%64
+                    n += 1
+                r = r >> 1
+            p += 1
+        sm[0] = n
+        sm[1] = 0
+        sm[2] = start
+        sm[3] = p
+
+    @micropython.viper
+    def _spawn(self, lo: int, p: int):
+        # Spawn the scheduled monsters for camera positions after lo, up to p
         xp = ptr32(self._x)
-        p = scroll[3]
         # Only spawn when scrolling into unseen tape
         if xp[0] >= p:
             return
-        spawner = self.spawner
-        rates = ptr8(spawner[1])
-        types = ptr8(spawner[0])
-        r = int(uint(ihash(p))>>3)
-        # Loop through each monster type, randomly spawning at configured rate
-        for i in range(0, int(len(spawner[0]))):
-            if r%2057 < rates[i]:
-                self.mons_add(types[i], p+72+36, r%64)
-            r = r >> 1
-        xp[0] = p 
+        if lo < xp[0]:
+            lo = xp[0]
+        xp[0] = p
+        sm = ptr32(self._sched)
+        sx = ptr32(self._sched_x)
+        st = ptr8(self._sched_m)
+        add = self.mons_add
+        while lo < p:
+            if not sm[2] <= lo+1 < sm[3]:
+                self._schedule(lo+1)
+            end = sm[3]-1 if sm[3]-1 < p else p
+            n = sm[0]
+            c = sm[1]
+            while c < n and sx[c] <= end:
+                if sx[c] > lo:
+                    add(st[c*2], sx[c]+72+36, st[c*2+1])
+                c += 1
+            sm[1] = c
+            lo = end
 
     @micropython.viper
     def redraw_tape(self, layer: int, x: int, pattern, fill_pattern):
         tape = ptr32(self._tape)
         l = 3 if layer == 2 else layer
+        self._touch(l, x)
+        self._vary(layer, x)
+        if ptr32(self._nstale)[layer]:
+            st = ptr8(self._stale)
+            s = layer*216 + x%216
+            if st[s] and (l == 0 or fill_pattern):
+                # The whole column is replaced
+                st[s] = 0
+                ptr32(self._nstale)[layer] -= 1
+            else:
+                self._refill(layer, x)
         offX = l*432 + x%216*2
         tape[offX] = int(pattern(x, 0))
         tape[offX+1] = int(pattern(x, 32))
@@ -245,6 +787,9 @@ class Tape:
         l = 3 if layer == 2 else layer
         p = ptr32(self._tape_scroll)[l]
         if -72 <= x - p < 144:
+            if ptr32(self._nstale)[layer]:
+                self._refill(layer, x)
+            self._touch(l, x)
             offX = l*432 + x%216*2
             tape[offX] &= int(pattern(x, 0))
             tape[offX+1] &= int(pattern(x, 32))
@@ -256,6 +801,10 @@ class Tape:
     def draw_tape(self, layer: int, x: int, pattern, fill_pattern):
         tape = ptr32(self._tape)
         l = 3 if layer == 2 else layer
+        if ptr32(self._nstale)[layer]:
+            self._refill(layer, x)
+        self._touch(l, x)
+        self._vary(layer, x)
         offX = l*432 + x%216*2
         tape[offX] |= int(pattern(x, 0))
         tape[offX+1] |= int(pattern(x, 32))
@@ -275,78 +824,124 @@ class Tape:
         n = (-1 if x<c+10 or (d == -1 and x<c+40 and t%8==0) else
             1 if x>c+62 or (d == 1 and x>=c+12 and (1 if x>c+40 else
                 t%2 if x>c+30 else t%4==3 if x>c+20 else t%8==7)) else 0)
-        if n != 0:
+        if x < c-30 or x > c+102:
+            # Catch up with a far off target in one go
+            self.scroll_by(x-c-36)
+        elif n != 0:
             self.scroll_tape(n if c % 4 == 0 else 0, n*(c % 2), n)
         # Vertical offset
         y -= 20
         ptr32(self._tape_scroll)[4] = ((y if y >= 0 else 0) if y <= 24
             else 24) + t//2%(int(self.cam_shake)+1)*(1 if y<12 else -1)
 
+    def write(self, layer, text, x, y):
+        self._blit(layer, self._glyphs(text), x, y)
+
+    def _glyphs(self, text):
+        # Font columns for a line of text (4 per character, with spacing)
+        g = self._text.get(text)
+        if g is None:
+            abc = self._abc
+            abc_i = self._abc_i
+            g = bytearray(len(text)*4)
+            for i, c in enumerate(text.upper()):
+                j = abc_i.get(c, 0)*3
+                g[i*4:i*4+3] = abc[j:j+3]
+            self._text.put(text, g, len(g))
+        return g
+
     @micropython.viper
-    def write(self, layer: int, text, x: int, y: int):
-        text = text.upper()
+    def _blit(self, layer: int, glyphs, x: int, y: int):
         tape = ptr32(self._tape)
-        abc_b = ptr8(self._abc)
-        abc_i = self._abc_i
+        g = ptr8(glyphs)
+        n = int(len(glyphs))
         h = y - 8 # y position is from bottom of text
         mask = 864 if layer == 1 else 1728 if layer == 2 else 2160
         draw = 432 if layer == 1 else 1296 if layer == 2 else 2304
         w = 216 if layer == 1 or layer == 2 else 72
+        # Screen position of the text (to composite it again)
+        dirty = ptr8(self._dirty)
+        scroll = ptr32(self._tape_scroll)
+        sx = x - (scroll[1] if layer == 1 else scroll[3] if layer == 2 else 0)
+        tp = layer == 1 or layer == 2
+        stale = ptr32(self._nstale)[layer] if tp else 0
         b = 0xFE
-        for i in range(int(len(text))*4+1): # Clear space on mask layer
+        for i in range(n+1): # Clear space on mask layer
             xi = x-1+i
+            if stale:
+                self._refill(layer, xi)
+            if tp:
+                self._vary(layer, xi)
+            if 0 <= sx-1+i < 72:
+                dirty[sx-1+i] |= 3
             if layer != 1 and layer != 2 and (xi < 0 or xi >= 72): continue
             p = xi%w*2+mask
             tape[p] ^= tape[p] & (b >> -1-h if h+1 < 0 else b << h+1)
             tape[p+1] ^= tape[p+1] & (b >> 31-h if h-31 < 0 else b << h-31)
-        for i in range(int(len(text))):
-            for o in range(3):
-                p = (x+o+i*4)%w*2
-                b = abc_b[int(abc_i.get(text[i], 0))*3+o]
-                img1 = b >> 0-h if h < 0 else b << h
-                img2 = b >> 32-h if h-32 < 0 else b << h-32
-                # Draw to the draw layer
-                tape[p+draw] |= img1
-                tape[p+draw+1] |= img2
-                # Stencil text out of the clear background mask layer
-                tape[p+mask] |= img1
-                tape[p+mask+1] |= img2
+        for i in range(n):
+            b = g[i]
+            if not b:
+                continue
+            p = (x+i)%w*2
+            img1 = b >> 0-h if h < 0 else b << h
+            img2 = b >> 32-h if h-32 < 0 else b << h-32
+            # Draw to the draw layer
+            tape[p+draw] |= img1
+            tape[p+draw+1] |= img2
+            # Stencil text out of the clear background mask layer
+            tape[p+mask] |= img1
+            tape[p+mask+1] |= img2
 
-    @micropython.viper
-    def message(self, position: int, text, layer: int):
+    def _layout(self, position, text, layer):
+        # Split text into lines, returning [(font columns, x, y)] for
+        # each line (x is from the middle background scroll + 36 for
+        # centered middle background messages).
         lines = [""] # Split into lines
         for word in text.split(' '):
-            lenn = int(len(lines[-1]))
-            if (lenn + int(len(word)) + 1)*4 > 72 or word=="\n":
+            lenn = len(lines[-1])
+            if (lenn + len(word) + 1)*4 > 72 or word=="\n":
                 if lenn and lenn*4 < 72 and position:
                     lines[-1] += " "
                 lines.append("")
             if word == "\n":
                 continue
             lines[-1] += (" " if lines[-1] else "") + word
-        lenn = int(len(lines[-1]))
+        lenn = len(lines[-1])
         if lenn and lenn*4 < 72 and position:
             lines[-1] += " "
-        leng = int(len(lines))
+        leng = len(lines)
+        out = []
         if position == 0: # Centered
             x = 36
             y = 25-leng*3
             if layer == 1:
-                x += ptr32(self._tape_scroll)[1] + 36
                 y += 10
-            for i in range(leng):
-                line = lines[i]
+            for line in lines:
                 if line:
-                    self.write(layer, line, x-(int(len(line))*2), y)
+                    out.append((self._glyphs(line), x-len(line)*2, y))
                 y += 6
         else:
             if position == 1: # Top
                 y = 5
             if position == 2: # Bottom
                 y = 46 - 6*leng
-            for i in range(leng):
-                self.write(layer, lines[i], 0, y)
+            for line in lines:
+                out.append((self._glyphs(line), 0, y))
                 y += 6
+        return out
+
+    @micropython.viper
+    def message(self, position: int, text, layer: int):
+        # Use the laid out lines from the last time the message was shown
+        key = (text, position, layer)
+        lines = self._text.get(key)
+        if lines is None:
+            lines = self._layout(position, text, layer)
+            self._text.put(key, lines, int(len(lines))*24)
+        x = ptr32(self._tape_scroll)[1] + 36 if layer == 1 and position == 0 else 0
+        blit = self._blit
+        for line in lines:
+            blit(layer, line[0], x+int(line[1]), line[2])
 
     @micropython.viper
     def tag(self, text, x: int, y: int):
@@ -356,16 +951,49 @@ class Tape:
 
     @micropython.viper
     def blast(self, t: int, x: int, y: int):
-        scratch = self.scratch_tape
         # Tag the wall with an explostion mark
         tag = t%4
         self.tag("<BANG!>" if tag==0 else "<POW!>" if tag==1 else
             "<WHAM!>" if tag==3 else "<BOOM!>", x, y)
-        # Carve blast hole out of foreground
-        pattern = _gen_bang(x, y, 8, 0)
-        fill = _gen_bang(x, y, 10, 1)
-        for i in range(x-10, x+10):
-            scratch(2, i, pattern, fill)
+        # Queue the blast hole to carve out of the foreground
+        bq = ptr32(self._blasts)
+        if bq[0] == _BLASTS:
+            self.carve_blasts()
+        n = bq[0]*2+1
+        bq[n] = x
+        bq[n+1] = y
+        bq[0] += 1
+
+    @micropython.viper
+    def carve_blasts(self):
+        # Carve all the queued blast holes out of the foreground
+        tape = ptr32(self._tape)
+        bang = ptr32(_bang)
+        bq = ptr32(self._blasts)
+        p = ptr32(self._tape_scroll)[3]
+        nst = ptr32(self._nstale)
+        for b in range(1, bq[0]*2+1, 2):
+            bx = bq[b]
+            by = bq[b+1]
+            for tx in range(-10, 10):
+                x = bx+tx
+                if not -72 <= x - p < 144:
+                    continue
+                if nst[2]:
+                    self._refill(2, x)
+                self._touch(3, x)
+                offX = x%216*2+1296
+                carve = bang[tx*2+20]
+                fill = bang[tx*2+21]
+                # Shift the stencils to the blast row for each word
+                for w in range(2):
+                    s = by-16-w*32
+                    if -32 < s < 32:
+                        tape[offX+w] &= -1 ^ (
+                            carve << s if s >= 0 else carve >> 0-s)
+                        tape[offX+w+432] |= (
+                            fill << s if s >= 0 else fill >> 0-s)
+        bq[0] = 0
 
     @micropython.viper
     def clear_overlay(self):
@@ -374,3 +1002,4 @@ class Tape:
             tape[i] = -1
         for i in range(2304, 2448):
             tape[i] = 0
+        self._redirty()
@@ -27,6 +27,41 @@ def fsqrt(v: int) -> int:
     b = v//a; a = (a+b)>>1
     return a
 
+## Word masks ##
+# Build a column word (32 rows from oY) directly, for patterns that are
+# simple heights or repetitions, rather than setting each row in a loop.
+
+@micropython.viper
+def mask_above(h: int, oY: int) -> int:
+    # Rows where y < h
+    n = h-oY
+    return 0 if n <= 0 else -1 if n >= 32 else (1 << n) - 1
+
+@micropython.viper
+def mask_below(h: int, oY: int) -> int:
+    # Rows where y > h
+    n = h+1-oY
+    return -1 if n <= 0 else 0 if n >= 32 else -1 << n
+
+@micropython.viper
+def mask_span(a: int, b: int, oY: int) -> int:
+    # Rows where a <= y < b
+    n = b-oY
+    v = 0 if n <= 0 else -1 if n >= 32 else (1 << n) - 1
+    n = a-oY
+    return v & (-1 if n <= 0 else 0 if n >= 32 else -1 << n)
+
+@micropython.viper
+def mask_stripes(period: int, width: int, phase: int, oY: int) -> int:
+    # Rows where (y-phase)%period < width
+    i = (phase-oY)%period # First whole stripe
+    s = (1 << width) - 1
+    v = s << i | s >> period-i # (and the end of the stripe before it)
+    while period < 32:
+        v |= v << period
+        period += period
+    return v
+
 sinco = bytearray([127, 125, 123, 121, 119, 117, 115, 113, 111, 109, 107, 105,
     103, 101, 99, 97, 95, 93, 91, 89, 87, 85, 83, 82, 80, 78, 76, 74, 72, 71,
     69, 67, 65, 64, 62, 60, 58, 57, 55, 53, 52, 50, 49, 47, 46, 44, 43, 41, 40,
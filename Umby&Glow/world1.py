@@ -6,23 +6,18 @@ class W:
             buff[0] = int(shash(x,32,48)) + int(shash(x,16,24)) + int(shash(x,4,16))
             buff[1] = int(abs(int(shash(x,8,32)) - (buff[0] >> 2)))
             buff[2] = int(x % (buff[0]>>3) == 0)
-        v = 0
-        for y in range(oY, oY+32):
-            v |= (
-                int(y > buff[0]) | int(y < buff[1]) | int(y <= 5)
-             ) << (y-oY)
-        return v
+        # Ground below, roof above, and cap at the top
+        return -1 ^ int(mask_span(buff[1], buff[0]+1, oY)) | (63 if oY == 0 else 0)
     @micropython.viper
     def pattern_cave_fill(self, x: int, oY: int) -> int:
         buff = ptr32(_buf)
-        v = 0
-        for y in range(oY, oY+32):
-            v |= (
-                ((int(y < (buff[0]>>1)*3) | buff[2]) # ground fill
-                # ceiling fill
-                & (int(y > 10-buff[1]) | int(y > 5) | int(y == 5) | buff[1]%(y+1)))
-            ) << (y-oY)
-        return v
+        # ceiling fill
+        v = int(mask_below(10-buff[1] if buff[1] > 6 else 4, oY))
+        if oY == 0:
+            for y in range(5):
+                v |= (buff[1]%(y+1) & 1) << y
+        # ground fill
+        return v if buff[2] else v & int(mask_above((buff[0]>>1)*3, oY))
 
     @micropython.viper
     def pattern_stalagmites(self, x: int, oY: int) -> int:
@@ -33,21 +28,11 @@ class W:
             t3 = (x%4)-2
             buff[0] = 50 - (t1*t1>>8) - (t2*t2>>2) - t3*t3*4
             buff[1] = 15*(x%4)
-        v = 0
-        for y in range(oY, oY+32):
-            v |= (
-                int(y < buff[0]) | int(y > 64 - buff[0])
-            ) << (y-oY)
-        return v
+        return -1 ^ int(mask_span(buff[0], 65 - buff[0], oY))
     @micropython.viper
     def pattern_stalagmites_fill(self, x: int, oY: int) -> int:
         buff = ptr32(_buf)
-        v = 0
-        for y in range(oY, oY+32):
-            v |= (
-                int(y+20 > buff[0]) & int(y-buff[1] < 64 - buff[0])
-            ) << (y-oY)
-        return v
+        return int(mask_span(buff[0]-19, 64 - buff[0] + buff[1], oY))
 
     @micropython.viper
     def pattern_toplit_wall(self, x: int, oY: int) -> int:
@@ -64,10 +49,5 @@ class W:
         buff = ptr32(_buf) # [ground-height]
         if oY == 0:
             buff[0] = 10 + int(shash(x,32,24))+int(shash(x,24,8))+int(shash(x,7,2))
-        v = 0
-        for y in range(oY, oY+32):
-            v |= (
-                int(y > buff[0]) | int(y < buff[0]-10)
-             ) << (y-oY)
-        return v
+        return -1 ^ int(mask_span(buff[0]-10, buff[0]+1, oY))
 w = W()
\ No newline at end of file
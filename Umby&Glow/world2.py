@@ -32,12 +32,9 @@ class W:
             buff[0] = ((int(shash(x,16,8)) + u-20-e*e)>>1)+10
             buff[1] = int(ihash(x>>6))%12+1
             buff[2] = u>>1
-        v = 0
-        for y in range(oY, oY+32):
-            v |= (
-                int(buff[1] > y > buff[1]-buff[0]) | int(y>58-buff[2])
-             ) << (y-oY)
-        return v
+        # Clouds and ground
+        return (int(mask_span(buff[1]-buff[0]+1, buff[1], oY))
+            | int(mask_below(58-buff[2], oY)))
 
     @micropython.viper
     def pattern_ferns(self, x: int, oY: int) -> int:
@@ -45,18 +42,22 @@ class W:
         if oY == 0:
             buff[0] = int(shash(x,64,40))+int(shash(x,32,48))+int(shash(x,4,8))-10
         v = 0
-        for y in range(oY, oY+32):
+        # Only the rows below the fern tops
+        t = buff[0] + 6
+        for y in range(t if t > oY else oY, oY+32):
             v |= (
-                (int(y > (32423421^(x*(y-buff[0])))%128) if y > buff[0] + 5 else 0)
+                int(y > (32423421^(x*(y-buff[0])))%128)
              ) << (y-oY)
         return v
     @micropython.viper
     def pattern_ferns_fill(self, x: int, oY: int) -> int:
         buff = ptr32(_buf)
-        v = 0
-        for y in range(oY, oY+32):
+        t = buff[0] + 6
+        v = int(mask_above(t, oY))
+        # Only the rows below the fern tops
+        for y in range(t if t > oY else oY, oY+32):
             v |= (
-                (int(y > (32423421^(x*(y-buff[0])))%64) if y > buff[0] + 5 else 1)
+                int(y > (32423421^(x*(y-buff[0])))%64)
              ) << (y-oY)
         return v
 
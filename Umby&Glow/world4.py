@@ -45,17 +45,13 @@ class W:
                 2 if plse<3 or pnd-plse<11 else 0)
         pllvl = buff[1]
         chain = buff[2]
-        v = 0
-        for y in range(oY, oY+32):
-            cy = y-pllvl+1
-            v |= (
-                1 if y>45-buff[0] else # Ground and boxes
-                1 if pllvl < y < pllvl+3 # Platforms
-                    or ((0 if chain!=0 and y==0 else chain) # Prevent Molaar traps
-                        and y < pllvl and ( # Chains
-                            cy%3==0 and chain==1 or cy%3>0 and chain==2))
-                else 0
-             ) << (y-oY)
+        # Ground and boxes and platforms
+        v = int(mask_below(45-buff[0], oY)) | int(mask_span(pllvl+1, pllvl+3, oY))
+        if chain:
+            # Chains (top row empty to prevent Molaar traps)
+            v |= (int(mask_stripes(3, 1, pllvl-1, oY) if chain == 1
+                else mask_stripes(3, 2, pllvl, oY))
+                & int(mask_above(pllvl, oY)) & (-2 if oY == 0 else -1))
         return v
     @micropython.viper
     def pattern_launch_area_fill(self, x: int, oY: int) -> int:
@@ -100,26 +96,19 @@ class W:
                 2 if plse<3 or pnd-plse<11 else 0)
         pllvl = buff[1]
         chain = buff[2]
-        v = 0
-        for y in range(oY, oY+32):
-            cy = y-pllvl+1
-            v |= (
-                1 if y>45 else # Ground
-                1 if pllvl < y < pllvl+3 # Platforms
-                    or ((0 if chain!=0 and y==0 else chain) # Prevent Molaar traps
-                        and y < pllvl and ( # Chains
-                            cy%3==0 and chain==1 or cy%3>0 and chain==2))
-                else 0
-             ) << (y-oY)
+        # Ground and platforms
+        v = int(mask_below(45, oY)) | int(mask_span(pllvl+1, pllvl+3, oY))
+        if chain:
+            # Chains (top row empty to prevent Molaar traps)
+            v |= (int(mask_stripes(3, 1, pllvl-1, oY) if chain == 1
+                else mask_stripes(3, 2, pllvl, oY))
+                & int(mask_above(pllvl, oY)) & (-2 if oY == 0 else -1))
         return v
     @micropython.viper
     def pattern_launch_pad_fill(self, x: int, oY: int) -> int:
-        v = 0
-        for y in range(oY, oY+32):
-            v |= (
-                0 if y//3%2==0 and ((x+y)//3)%2 and y>45 else 1
-             ) << (y-oY)
-        return v
+        # Ground pattern
+        return -1 ^ (int(mask_stripes(6, 3, 0, oY))
+            & int(mask_stripes(6, 3, 3-x, oY)) & int(mask_below(45, oY)))
 
     @micropython.viper
     def pattern_launch_back(self, x: int, oY: int) -> int:
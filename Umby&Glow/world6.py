@@ -84,12 +84,7 @@ class W:
     @micropython.viper
     def pattern_cable(self, x: int, oY: int) -> int:
         rh = int(shash(x,60,80))-8
-        v = 0
-        for y in range(oY, oY+32):
-            v |= (
-                int(rh-4 <= y <= rh+4)
-            ) << (y-oY)
-        return v
+        return int(mask_span(rh-4, rh+5, oY))
 
     @micropython.viper
     def pattern_cabling(self, x: int, oY: int) -> int:
@@ -0,0 +1,136 @@
+## Tape Baker ##
+# Pre-generates the tape columns of every level in script.txt into a
+# "world{N}.bake" file per world. When a baked world is loaded, the tape
+# streams its columns from flash instead of evaluating the world patterns.
+#
+# This must be run with MicroPython on the Thumby itself, so the viper
+# patterns give exactly the same 32 bit results as they do in game.
+# From the root of this repository:
+#     mpremote mount . run tools/bake_tape.py
+# then copy the generated "Umby&Glow/world*.bake" files along with the game.
+# Bakes are ignored by the game once the world file or utils.py changes
+# (checked with a CRC-32 of them), so rebake after editing a world,
+# utils.py, or the levels in script.txt.
+
+from array import array
+from binascii import crc32
+from os import stat
+from struct import pack
+import sys
+
+for _dir in ("Umby&Glow/", "/Games/Umby&Glow/"):
+    try:
+        stat(_dir + "script.txt")
+        break
+    except OSError:
+        pass
+sys.path.insert(0, _dir.rstrip("/"))
+from utils import *
+
+_BLOCK = const(64) # Columns per block (must match tape.py)
+_MAX_SECTION = const(8192) # Limit for the open ended last level
+
+def _levels():
+    # Find the position of each level event and the position it ends at
+    # as [(start, end, world, feed names)].
+    lvls = []
+    pos = 0
+    with open(_dir + "script.txt") as fp:
+        for line in fp:
+            if line and line[0] != "#" and line[0] != "\n":
+                dist, _, ev = line.partition(",")
+                pos += int(dist)
+                ev = ev.strip()
+                if ev[0] == "(":
+                    if lvls:
+                        lvls[-1][1] = pos
+                    # ("world","[feed]",(spawner),flags)
+                    parts = ev.split('"')
+                    lvls.append([pos, pos+_MAX_SECTION, parts[1],
+                        [n.strip("[] ") for n in parts[3].split(',')]])
+    return lvls
+
+def _sections(lvls, world):
+    # Merge the level ranges into sections for each layer and feed key
+    # (layer, key, x0, x1) for each layer column range the key is used for.
+    secs = []
+    for start, end, wld, k in lvls:
+        if wld != world:
+            continue
+        for layer, key, div in ((0, k[0], 4), (1, k[1]+","+k[2], 2),
+                (2, k[3]+","+k[4], 1)):
+            if "w." not in key:
+                continue # Builtin patterns are cheaper than streaming
+            x0, x1 = start//div-72, end//div+144
+            for s in secs:
+                if s[0] == layer and s[1] == key and s[2] <= x1 and x0 <= s[3]:
+                    s[2], s[3] = min(s[2], x0), max(s[3], x1)
+                    break
+            else:
+                secs.append([layer, key, x0, x1])
+    return secs
+
+def _encode(out, patterns, x0, x1):
+    # Write the column blocks for a section, returning the block offsets.
+    pattern, fill = patterns
+    offs = []
+    cur = array('l', [0, 0, 0, 0])
+    for x in range(x0, x1):
+        if (x-x0) % _BLOCK == 0:
+            offs.append(out.tell())
+            prev = array('l', [0, 0, 0, 0])
+        cur[0] = pattern(x, 0)
+        cur[1] = pattern(x, 32)
+        if fill:
+            cur[2] = fill(x, 0)
+            cur[3] = fill(x, 32)
+        m = 0
+        for k in range(4):
+            if cur[k] != prev[k]:
+                m |= 1 << k
+        out.write(bytes([m]))
+        for k in range(4):
+            if m >> k & 1:
+                out.write(pack("<i", cur[k]))
+        prev[:] = cur
+    offs.append(out.tell())
+    return offs
+
+def _crc(path, crc=0):
+    # CRC-32 of a file (continuing from crc), as the game checks it
+    with open(path, "rb") as fp:
+        return crc32(fp.read(), crc)
+
+def bake(world):
+    src = _dir + "world" + world + ".py"
+    secs = _sections(_levels(), world)
+    if not secs:
+        return
+    g = {"_buf": array('l', [0, 0, 0, 0, 0, 0, 0, 0])}
+    exec("from utils import *", g)
+    with open(src) as fp:
+        exec(fp.read(), g)
+    print("Baking world", world, "-", len(secs), "sections")
+    with open(_dir + "world" + world + ".bake", "wb") as out:
+        crc = _crc(_dir + "utils.py", _crc(src))
+        out.write(b"UGB1" + pack("<IH", crc, len(secs)))
+        # Section table (with the block index offsets filled in later)
+        table = out.tell()
+        for layer, key, x0, x1 in secs:
+            out.write(bytes([layer, len(key)]) + key.encode()
+                + pack("<iiI", x0, x1, 0))
+        idxs = []
+        for layer, key, x0, x1 in secs:
+            names = key.split(",")
+            patterns = (eval(names[0], g), eval(names[1], g) if layer else None)
+            offs = _encode(out, patterns, x0, x1)
+            idxs.append(out.tell())
+            out.write(pack("<" + "I"*len(offs), *offs))
+            print(" ", layer, key, x0, x1, offs[-1]-offs[0], "bytes")
+        out.seek(table)
+        for (layer, key, x0, x1), idx in zip(secs, idxs):
+            out.write(bytes([layer, len(key)]) + key.encode()
+                + pack("<iiI", x0, x1, idx))
+
+for _w in "1234567":
+    bake(_w)
@@ -0,0 +1,50 @@
+## Precompiled World and Monster Modules ##
+# Compiles each "world{N}.py" and "mons{N}.py" into a "world{N}_c.mpy" and
+# "mons{N}_c.mpy" module. When a world is loaded, the game imports these
+# instead of reading and compiling the source at the chapter transition.
+# This runs with regular Python on the computer (not on the Thumby), and
+# needs the mpy-cross compiler matching the MicroPython version on the
+# Thumby (e.g. "pip install mpy-cross==1.19.1").
+# From the root of this repository:
+#     python3 tools/build_mpy.py [mpy-cross command]
+# then copy the generated "Umby&Glow/*_c.mpy" files along with the game.
+# Compiled modules are ignored by the game once the source file changes
+# (checked with a CRC-32 of it), so rebuild after editing a world or
+# monster file.
+
+from binascii import crc32
+import os
+import subprocess
+import sys
+import tempfile
+
+_DIR = "Umby&Glow/"
+# Names the source files use from the script module they are run in,
+# and the CRC-32 of the source so the game can tell if it's out of date
+# (kept to one line so line numbers in errors are only out by one).
+_HEADER = ("from script import *; from script import _buf, _mons as mons; "
+    "_SRC_CRC = %d\n")
+
+def build(name, mpy_cross):
+    src = _DIR + name + ".py"
+    with open(src, "rb") as fp:
+        code = fp.read()
+    code = (_HEADER % crc32(code)).encode() + code
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, name + "_c.py")
+        with open(path, "wb") as fp:
+            fp.write(code)
+        # Viper and native code needs the architecture of the RP2040
+        subprocess.run([mpy_cross, "-march=armv6m", "-s", name + ".py",
+            "-o", _DIR + name + "_c.mpy", path], check=True)
+    print(name, os.stat(_DIR + name + "_c.mpy").st_size, "bytes")
+
+def main():
+    mpy_cross = sys.argv[1] if len(sys.argv) > 1 else "mpy-cross"
+    for f in sorted(os.listdir(_DIR)):
+        if ((f.startswith("world") or f.startswith("mons")) and f.endswith(".py")
+                and f[:-3][-1].isdigit()):
+            build(f[:-3], mpy_cross)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+## Script Compiler ##
+# Compiles script.txt into "script.bin", an index of the script events the
+# game can seek into, instead of parsing the whole script to find the
+# chapters or the event at a save position. Level events are resolved into
+# compact level records, so changing level in game needs no parsing.
+# This runs with regular Python on the computer (not on the Thumby).
+# From the root of this repository:
+#     python3 tools/compile_script.py
+# then copy the generated "Umby&Glow/script.bin" along with the game.
+# The compiled script is ignored by the game once script.txt changes
+# (checked with a CRC-32 of it), so recompile after editing the script.
+# Level events with unknown pattern or monster names are reported (and
+# nothing is written), rather than failing when reached in game.
+#
+# File layout (little endian):
+#     "UGS2", script.txt CRC-32 (I), event count (H), chapter count (H),
+#         pattern name count (H), level record count (H)
+#     event table, for each event: position (i), furthest position of the
+#         events so far (i), text offset (I), last level event index+1 (H),
+#         level record index+1 (H)
+#     chapter table, for each chapter: position (i), name offset (I)
+#     pattern names, for each feed pattern name: text offset (I)
+#     level records, for each level event: record offset (I)
+#     records: world (B), feed pattern name indices (5B), flags (B),
+#         monster pool size (B), spawner monster type count n (B),
+#         monster types (nB), spawn rates (nB)
+#     text: for each event, chapter name and pattern name, length (H)
+#         then utf-8 text
+
+from ast import literal_eval
+from binascii import crc32
+from struct import pack
+import re
+import sys
+
+from spawns import _monster_types
+
+_DIR = "Umby&Glow/"
+_HEADER = 16
+_EVENT = 16 # Size of each event table entry
+_CHAPTER = 8 # Size of each chapter table entry
+
+def _events():
+    # Each script event as (position, event text, line number),
+    # as the game reads them
+    events = []
+    pos = 0
+    with open(_DIR + "script.txt") as fp:
+        for ln, line in enumerate(fp):
+            if line and line[0] != "#" and line[0] != "\n":
+                dist, _, ev = line.partition(",")
+                pos += int(dist)
+                events.append((pos, ev.strip(), ln+1))
+    return events
+
+def _crc(path):
+    # CRC-32 of a file, as the game checks it
+    with open(path, "rb") as fp:
+        return crc32(fp.read())
+
+def _defined(path):
+    # Names of the functions defined in a source file
+    with open(path) as fp:
+        return set(re.findall(r"^\s*def (\w+)\(", fp.read(), re.M))
+
+def _levels(events):
+    # Resolve the level events into records, with the feed pattern names
+    # as indices into the name table. Returns (names, records, errors).
+    monsters = _monster_types()
+    utils = _defined(_DIR + "utils.py")
+    worlds = {}
+    names = []
+    records = {}
+    errors = []
+    for i, (pos, ev, ln) in enumerate(events):
+        if ev[0] != "(":
+            continue
+        try:
+            lvl = eval(ev, dict(monsters, bytearray=bytearray))
+        except NameError as e:
+            errors.append(f"line {ln}: {e}")
+            continue
+        world, feed, (types, rates), flags = lvl[:4]
+        pool = lvl[4] if len(lvl) > 4 else 48
+        if world not in worlds:
+            worlds[world] = _defined(_DIR + f"world{world}.py")
+        feed = [n.strip("[] ") for n in feed.split(",")]
+        if len(feed) != 5:
+            errors.append(f"line {ln}: feed needs 5 patterns, not {len(feed)}")
+            continue
+        for n in feed:
+            known = (n[2:] in worlds[world] if n.startswith("w.")
+                else n in utils)
+            if not known:
+                errors.append(f"line {ln}: unknown pattern {n} for world {world}")
+            if n not in names:
+                names.append(n)
+        records[i] = bytes([int(world)] + [names.index(n) for n in feed]
+            + [flags, pool, len(types)]) + bytes(types) + bytes(rates)
+    return names, records, errors
+
+def compile_script():
+    events = _events()
+    names, records, errors = _levels(events)
+    if errors:
+        print("\n".join(errors))
+        sys.exit(1)
+    # Chapter menu entries (with positions as get_chapters gives them)
+    chapters = [(pos-145, literal_eval(ev)) for pos, ev, ln in events
+        if ev.startswith('"CHAPTER~') or ev.startswith('"~')]
+    # Data after the tables
+    base = (_HEADER + len(events)*_EVENT + len(chapters)*_CHAPTER
+        + len(names)*4 + len(records)*4)
+    data = bytearray()
+    recs = []
+    for i in sorted(records):
+        recs.append(base + len(data))
+        data += records[i]
+    offs = []
+    for s in ([ev for pos, ev, ln in events] + [name for pos, name in chapters]
+            + names):
+        offs.append(base + len(data))
+        b = s.encode()
+        data += pack("<H", len(b)) + b
+    out = bytearray(b"UGS2" + pack("<IHHHH",
+        _crc(_DIR + "script.txt"), len(events), len(chapters),
+        len(names), len(records)))
+    furthest = events[0][0]
+    lvl = 0
+    rec = sorted(records)
+    for i, (pos, ev, ln) in enumerate(events):
+        furthest = max(furthest, pos)
+        if i and ev[0] == "(":
+            lvl = i+1
+        out += pack("<iiIHH", pos, furthest, offs[i], lvl,
+            rec.index(i)+1 if i in records else 0)
+    for i, (pos, name) in enumerate(chapters):
+        out += pack("<iI", pos, offs[len(events)+i])
+    for i in range(len(names)):
+        out += pack("<I", offs[len(events)+len(chapters)+i])
+    for r in recs:
+        out += pack("<I", r)
+    out += data
+    with open(_DIR + "script.bin", "wb") as fp:
+        fp.write(out)
+    print(len(events), "events,", len(chapters), "chapters,", len(records),
+        "levels,", len(names), "pattern names,", len(out), "bytes")
+
+if __name__ == "__main__":
+    compile_script()
@@ -0,0 +1,96 @@
+## Spawn Schedule Report ##
+# Lists the monsters the tape spawner rolls for each level in script.txt,
+# for balancing spawn rates without playing through.
+# This runs with regular Python on the computer (not on the Thumby).
+# From the root of this repository:
+#     python3 tools/spawns.py [chapter filter]
+# e.g. "python3 tools/spawns.py Cave" for just the levels of the cave chapter.
+# Spawns are rolled as the camera scrolls into unseen tape, so this shows the
+# spawns of a straight run through each level.
+
+import re
+import sys
+
+_DIR = "Umby&Glow/"
+_AHEAD = 108 # How far ahead of the camera monsters are spawned
+
+def _ihash(x):
+    # 32 bit integer hash (as utils.ihash)
+    x &= 0xFFFFFFFF
+    x = (x ^ 61) ^ (x >> 16)
+    x = (x + (x << 3)) & 0xFFFFFFFF
+    x ^= (x >> 4)
+    x = (x * 0x27d4eb2d) & 0xFFFFFFFF
+    return x ^ (x >> 15)
+
+def _monster_types():
+    # Monster names usable in the script, with their type ids
+    consts = {}
+    names = {}
+    with open(_DIR + "monsters.py") as fp:
+        for line in fp:
+            m = re.match(r"(_\w+) = const\((\d+)\)", line)
+            if m:
+                consts[m[1]] = int(m[2])
+            m = re.match(r"(\w+) = (_\w+)$", line.strip())
+            if m and m[2] in consts:
+                names[m[1]] = consts[m[2]]
+    return names
+
+def _levels(names):
+    # Find each level event as (start, end, chapter, (types, rates))
+    lvls = []
+    chapter = ""
+    pos = 0
+    with open(_DIR + "script.txt") as fp:
+        for line in fp:
+            if line and line[0] != "#" and line[0] != "\n":
+                dist, _, ev = line.partition(",")
+                pos += int(dist)
+                ev = ev.strip()
+                if ev.startswith('"CHAPTER~'):
+                    chapter = ev[9:].split('"')[0].replace(" \\n ", " ")
+                elif ev[0] == "(":
+                    if lvls:
+                        lvls[-1][1] = pos
+                    lvl = eval(ev, dict(names))
+                    lvls.append([pos, pos, chapter, lvl[2]])
+    if lvls:
+        lvls[-1][1] = pos # Last level runs to the end of the script
+    return lvls
+
+def schedule(spawner, start, end):
+    # Spawns [(camera position, type, y)] from start up to end
+    types, rates = spawner
+    spawns = []
+    for p in range(start, end):
+        r = _ihash(p) >> 3
+        for i in range(len(types)):
+            if r%2057 < rates[i]:
+                spawns.append((p, types[i], r%64))
+            r >>= 1
+    return spawns
+
+def main():
+    names = _monster_types()
+    ids = dict((v, k) for k, v in names.items())
+    find = sys.argv[1] if len(sys.argv) > 1 else ""
+    for start, end, chapter, spawner in _levels(names):
+        if not spawner[0] or find not in chapter:
+            continue
+        spawns = schedule(spawner, start, end)
+        print(f"{chapter}: {start} to {end} ({end-start} columns)")
+        for t in spawner[0]:
+            n = sum(1 for s in spawns if s[1] == t)
+            print(f"    {ids.get(t, t):16}{n:5} ({n*1000//((end-start) or 1)}"
+                " per 1000 columns)")
+        # Spawns in each 256 columns
+        dens = [0]*((end-start+255)//256)
+        for p, t, y in spawns:
+            dens[(p-start)//256] += 1
+        print("    density:", " ".join(str(d) for d in dens))
+        print("    first:", ", ".join(f"{ids.get(t, t)}@{p+_AHEAD},{y}"
+            for p, t, y in spawns[:6]))
+
+if __name__ == "__main__":
+    main()